@@ -0,0 +1,140 @@
+"""Бенчмарк сохранения и чтения ответов модели в форматах CSV, JSONL и Parquet.
+
+Ответы создаются так же, как их накапливают раннеры: список dataclass-объектов с полями
+sample_id и model_answer. Для каждого формата замеряются время записи через
+AbstractDatasetRunner.save_answers, размер файла и время чтения функцией read_answers.
+С флагом --baseline дополнительно замеряется прежний способ сохранения через
+pd.DataFrame из asdict() и to_csv.
+
+Пример:
+    python benchmarks/bench_answers.py --num-answers 10000000 --output bench_results/answers.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import importlib.util
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+from run_benchmarks import REPO_ROOT, _git_revision
+
+# Скрипт запускается из корня репозитория как python benchmarks/bench_answers.py, и пакет не установлен
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+@dataclass
+class _Answer:
+    sample_id: int
+    model_answer: str
+
+
+class _Iterator:
+    dataset_name = "bench"
+    task_name = "VQA"
+
+
+class _Model:
+    model_name = "stub"
+    framework = "bench"
+
+
+def _make_runner(answers: List[_Answer], answers_dir_path: str, answers_format: str):
+    from dataset_iterator.vqa_dataset_runner import VQADatasetRunner
+
+    runner = VQADatasetRunner(_Iterator(), _Model(), answers_dir_path, answers_format=answers_format)
+    runner.model_answers = answers
+    return runner
+
+
+def bench_format(answers: List[_Answer], work_dir: str, answers_format: str) -> Dict:
+    """Замеряет запись и чтение ответов в одном формате."""
+    from dataset_iterator.answer_sink import read_answers
+
+    runner = _make_runner(answers, os.path.join(work_dir, answers_format), answers_format)
+    start = time.perf_counter()
+    path = runner.save_answers()
+    write_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    num_read = sum(1 for _ in read_answers(path))
+    read_s = time.perf_counter() - start
+    assert num_read == len(answers), f"{answers_format}: read {num_read} of {len(answers)} answers"
+
+    return {
+        "format": answers_format,
+        "write_s": write_s,
+        "read_s": read_s,
+        "size_mb": os.path.getsize(path) / 1024 ** 2,
+    }
+
+
+def bench_baseline(answers: List[_Answer], work_dir: str) -> Dict:
+    """Замеряет прежнее сохранение ответов: DataFrame из asdict() и to_csv, чтение через csv.DictReader."""
+    import csv
+    import pandas as pd
+
+    path = os.path.join(work_dir, "baseline.csv")
+    start = time.perf_counter()
+    pd.DataFrame([asdict(answer) for answer in answers]).to_csv(path, index=False, sep=";", encoding="utf-8-sig")
+    write_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        num_read = sum(1 for _ in csv.DictReader(f, delimiter=";"))
+    read_s = time.perf_counter() - start
+    assert num_read == len(answers)
+
+    return {
+        "format": "baseline_pandas_csv",
+        "write_s": write_s,
+        "read_s": read_s,
+        "size_mb": os.path.getsize(path) / 1024 ** 2,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-answers", type=int, default=10_000_000, help="Количество ответов.")
+    parser.add_argument("--formats", nargs="+", default=["csv", "jsonl", "parquet"], help="Форматы для замера.")
+    parser.add_argument("--baseline", action="store_true", help="Замерить прежнее сохранение через pandas.")
+    parser.add_argument("--output", default=None, help="Путь к JSON-файлу с результатами. По умолчанию stdout.")
+    args = parser.parse_args()
+
+    answers = [_Answer(i, f"answer {i % 1000}; \"quoted\"") for i in range(args.num_answers)]
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for answers_format in args.formats:
+            if answers_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+                result = {"format": answers_format, "error": "pyarrow is not installed"}
+            else:
+                result = bench_format(answers, work_dir, answers_format)
+            print(json.dumps(result), file=sys.stderr)
+            results.append(result)
+        if args.baseline:
+            result = bench_baseline(answers, work_dir)
+            print(json.dumps(result), file=sys.stderr)
+            results.append(result)
+
+    report = {
+        **_git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "num_answers": args.num_answers,
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
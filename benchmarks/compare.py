@@ -0,0 +1,60 @@
+"""Сравнение двух JSON-файлов с результатами run_benchmarks.py.
+
+Для каждого случая выводит значения метрик в базовом и новом запуске и их отношение.
+С флагом --max-regression скрипт завершается с ошибкой, если хотя бы одна метрика
+ухудшилась больше, чем на заданную долю.
+
+Пример:
+    python benchmarks/compare.py bench_results/base.json bench_results/new.json --max-regression 0.2
+"""
+import sys
+import json
+import argparse
+from typing import Dict
+
+# Метрики и направление: True - чем больше, тем лучше
+METRICS = {
+    "startup_s": False,
+    "samples_per_s": True,
+    "runner_samples_per_s": True,
+    "save_s": False,
+    "peak_rss_mb": False,
+}
+
+
+def _load(path: str) -> Dict[str, dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return {result["name"]: result for result in report["results"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="Результаты базового запуска.")
+    parser.add_argument("new", help="Результаты нового запуска.")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="Допустимое ухудшение метрики, например 0.2 для 20%%.")
+    args = parser.parse_args()
+
+    base, new = _load(args.base), _load(args.new)
+    regressions = []
+    print(f"{'case':<40} {'metric':<20} {'base':>12} {'new':>12} {'ratio':>8}")
+    for name in [name for name in base if name in new]:
+        for metric, higher_is_better in METRICS.items():
+            old_value, new_value = base[name].get(metric), new[name].get(metric)
+            # Отношение имеет смысл только для положительных значений
+            if old_value is None or new_value is None or old_value <= 0 or new_value <= 0:
+                continue
+            ratio = new_value / old_value
+            print(f"{name:<40} {metric:<20} {old_value:>12.4g} {new_value:>12.4g} {ratio:>8.2f}")
+            regression = 1 / ratio - 1 if higher_is_better else ratio - 1
+            if args.max_regression is not None and regression > args.max_regression:
+                regressions.append(f"{name} {metric}: {old_value:.4g} -> {new_value:.4g}")
+
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
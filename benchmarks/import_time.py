@@ -0,0 +1,105 @@
+"""Замер времени импорта модулей пакета через `python -X importtime`.
+
+Каждый модуль импортируется в отдельном процессе несколько раз, в отчёт попадает
+лучшее время. С флагом --check скрипт завершается с ошибкой, если модуль тянет за
+собой тяжёлые зависимости или импортируется дольше заданного бюджета.
+
+Пример:
+    python benchmarks/import_time.py --check --max-ms 50
+"""
+import re
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List
+
+DEFAULT_MODULES = [
+    "dataset_iterator.fabrics",
+    "dataset_iterator.cli",
+    "dataset_iterator.dataset_index",
+]
+
+# Зависимости, которые не должны импортироваться при старте пакета
+HEAVY_MODULES = ["pandas", "numpy", "tqdm", "prompt_adapter"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_import(module: str) -> Dict:
+    """Импортирует модуль в новом процессе и разбирает вывод -X importtime.
+
+    Аргументы:
+        module (str): Название модуля.
+
+    Возвращает:
+        Dict: Суммарное время импорта модуля в микросекундах и список импортированных модулей.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    cumulative_us = 0
+    imported = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.append(name)
+        if name == module:
+            cumulative_us = int(match.group(2))
+    return {"cumulative_us": cumulative_us, "imported": imported}
+
+
+def run_benchmark(modules: List[str], repeat: int) -> List[Dict]:
+    """Замеряет время импорта каждого модуля и находит импортированные тяжёлые зависимости.
+
+    Аргументы:
+        modules (List[str]): Названия модулей.
+        repeat (int): Количество запусков на модуль.
+
+    Возвращает:
+        List[Dict]: Результаты замеров по модулям.
+    """
+    results = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        imported = set(runs[0]["imported"])
+        heavy = sorted(name for name in HEAVY_MODULES if name in imported)
+        results.append({
+            "module": module,
+            "best_ms": min(run["cumulative_us"] for run in runs) / 1000,
+            "heavy_imports": heavy,
+            "modules_imported": len(imported),
+        })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Модули для замера.")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество запусков на модуль.")
+    parser.add_argument("--max-ms", type=float, default=None, help="Бюджет времени импорта одного модуля.")
+    parser.add_argument("--check", action="store_true",
+                        help="Завершиться с ошибкой при превышении бюджета или импорте тяжёлых зависимостей.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.modules, args.repeat)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    if not args.check:
+        return 0
+    failed = False
+    for result in results:
+        if result["heavy_imports"]:
+            print(f"{result['module']} imports {', '.join(result['heavy_imports'])}", file=sys.stderr)
+            failed = True
+        if args.max_ms is not None and result["best_ms"] > args.max_ms:
+            print(f"{result['module']} imports in {result['best_ms']:.1f} ms > {args.max_ms} ms", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""Бенчмарк итераторов и раннеров на синтетических датасетах разного размера.
+
+Для каждого датасета и варианта чтения (обход файлов или индекс) в отдельном процессе
+замеряются:
+    - startup_s: время создания итератора через IteratorFabric;
+    - samples_per_s: скорость итерирования по сэмплам;
+    - iterator_peak_rss_mb: пиковое потребление памяти после прохода по итератору;
+    - runner_samples_per_s: скорость прогона раннера с моделью без задержки по заранее
+      прочитанным сэмплам, без затрат итератора;
+    - save_s: время сохранения ответов;
+    - peak_rss_mb: пиковое потребление памяти процесса.
+
+Результаты сохраняются в JSON вместе с хешем коммита, файлы разных коммитов сравниваются
+скриптом compare.py.
+
+Пример:
+    python benchmarks/run_benchmarks.py --preset small --output bench_results/base.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+from synthetic import RPO_PROMPT_DIR_NAME, RPO_PROMPT_FILE_NAME, generate_rpo_dataset, generate_vqa_dataset
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRESETS = {
+    "small": {"vqa_rows": [10_000], "rpo_bundles": [1_000]},
+    "medium": {"vqa_rows": [10_000, 100_000, 1_000_000], "rpo_bundles": [1_000, 10_000, 100_000]},
+    "full": {"vqa_rows": [10_000, 100_000, 1_000_000, 10_000_000], "rpo_bundles": [1_000, 10_000, 100_000, 500_000]},
+}
+
+VARIANTS = ["files", "index"]
+
+
+class StubModel:
+    """Модель без задержки с интерфейсом examples/model.py, чтобы замерять только накладные расходы раннера."""
+
+    def __init__(self, model_name: str = "stub", framework: str = "bench") -> None:
+        self.model_name = model_name
+        self.framework = framework
+
+    def predict_on_image(self, image, question) -> str:
+        return "answer"
+
+    def predict_on_images(self, images, question) -> str:
+        return ",".join("1" for _ in images)
+
+
+class PrebuiltIterator:
+    """Итератор по заранее прочитанным сэмплам, чтобы замер раннера не включал чтение датасета."""
+
+    def __init__(self, samples: List, task_name: str, dataset_name: str) -> None:
+        self.samples = samples
+        self.task_name = task_name
+        self.dataset_name = dataset_name
+
+    def __iter__(self):
+        return iter(self.samples)
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS ru_maxrss в байтах, на Linux - в килобайтах
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case: Dict) -> Dict:
+    """Выполняет замер одного случая. Вызывается в отдельном процессе, чтобы пиковая память не смешивалась.
+
+    Аргументы:
+        case (Dict): Описание случая: аргументы итератора в "iterator" и флаг "build_index".
+
+    Возвращает:
+        Dict: Результаты замеров.
+    """
+    from dataset_iterator.dataset_index import build_index
+    from dataset_iterator.fabrics import IteratorFabric
+
+    iterator_kwargs = dict(case["iterator"])
+    result = {}
+
+    if case["build_index"]:
+        start = time.perf_counter()
+        iterator_kwargs["index_path"] = build_index(
+            iterator_kwargs["task_name"], iterator_kwargs["dataset_dir_path"],
+            iterator_kwargs.get("csv_name", "annotation.csv"), index_dir_path=case["work_dir"],
+        )
+        result["index_build_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    iterator = IteratorFabric.get_dataset_iterator(**iterator_kwargs)
+    result["startup_s"] = time.perf_counter() - start
+
+    num_samples = 0
+    start = time.perf_counter()
+    for _ in iterator:
+        num_samples += 1
+    iterate_s = time.perf_counter() - start
+    result["num_samples"] = num_samples
+    result["samples_per_s"] = num_samples / iterate_s if iterate_s else None
+    result["iterator_peak_rss_mb"] = _peak_rss_mb()
+
+    # Сэмплы читаются заранее, чтобы runner_samples_per_s не включал время итератора
+    samples = list(IteratorFabric.get_dataset_iterator(**iterator_kwargs))
+    iterator = PrebuiltIterator(samples, iterator.task_name, iterator.dataset_name)
+    runner = IteratorFabric.get_runner(iterator=iterator, model=StubModel(),
+                                       answers_dir_path=os.path.join(case["work_dir"], "answers"))
+    start = time.perf_counter()
+    runner.run()
+    run_s = time.perf_counter() - start
+    result["runner_samples_per_s"] = num_samples / run_s if run_s else None
+
+    start = time.perf_counter()
+    runner.save_answers()
+    result["save_s"] = time.perf_counter() - start
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _run_case_in_subprocess(case: Dict) -> Dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    # Прогресс-бар раннеров искажает замеры и засоряет вывод
+    env["TQDM_DISABLE"] = "1"
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", json.dumps(case)],
+        capture_output=True, text=True, env=env,
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _build_cases(data_dir: str, tasks: List[str], vqa_rows: List[int], rpo_bundles: List[int]) -> List[Dict]:
+    cases = []
+    if "vqa" in tasks:
+        for num_rows in vqa_rows:
+            dataset_dir_path = generate_vqa_dataset(os.path.join(data_dir, f"vqa_{num_rows}"), num_rows)
+            for variant in VARIANTS:
+                cases.append({
+                    "name": f"VQA/{num_rows}/{variant}",
+                    "size": num_rows,
+                    "iterator": {
+                        "task_name": "VQA",
+                        "dataset_name": "bench",
+                        "dataset_dir_path": dataset_dir_path,
+                        "csv_name": "annotations.csv",
+                    },
+                    "build_index": variant == "index",
+                })
+    if "rpo" in tasks:
+        for num_bundles in rpo_bundles:
+            dataset_dir_path = generate_rpo_dataset(os.path.join(data_dir, f"rpo_{num_bundles}"), num_bundles)
+            for variant in VARIANTS:
+                cases.append({
+                    "name": f"RPOClassification/{num_bundles}/{variant}",
+                    "size": num_bundles,
+                    "iterator": {
+                        "task_name": "RPOClassification",
+                        "dataset_name": "bench",
+                        "dataset_dir_path": dataset_dir_path,
+                        "prompt_file_dir": os.path.join(dataset_dir_path, RPO_PROMPT_DIR_NAME),
+                        "prompt_file_name": RPO_PROMPT_FILE_NAME,
+                    },
+                    "build_index": variant == "index",
+                })
+    return cases
+
+
+def _git_revision() -> Dict[str, Optional[str]]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, default="small", help="Набор размеров датасетов.")
+    parser.add_argument("--vqa-rows", type=int, nargs="+", default=None, help="Размеры датасетов VQA в строках.")
+    parser.add_argument("--rpo-bundles", type=int, nargs="+", default=None, help="Размеры датасетов RPO в пачках.")
+    parser.add_argument("--tasks", nargs="+", choices=["vqa", "rpo"], default=["vqa", "rpo"])
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "dataset_iterator_bench"),
+                        help="Директория для синтетических датасетов. Датасеты переиспользуются между запусками.")
+    parser.add_argument("--output", default=None, help="Путь к JSON-файлу с результатами. По умолчанию stdout.")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_case(json.loads(args.worker))))
+        return 0
+
+    preset = PRESETS[args.preset]
+    cases = _build_cases(args.data_dir, args.tasks,
+                         args.vqa_rows or preset["vqa_rows"], args.rpo_bundles or preset["rpo_bundles"])
+
+    results = []
+    for case in cases:
+        with tempfile.TemporaryDirectory() as work_dir:
+            case["work_dir"] = work_dir
+            metrics = _run_case_in_subprocess(case)
+        print(f"{case['name']}: {json.dumps(metrics)}", file=sys.stderr)
+        results.append({"name": case["name"], "size": case["size"], **metrics})
+
+    report = {
+        **_git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Генерация синтетических датасетов VQA и RPO для бенчмарков.
+
+Структура датасетов совпадает с описанной в README: для VQA - CSV-файл с аннотацией и
+директория images, для RPO - директории images/<id> с изображениями страниц, jsons/<id>.json
+с правильными ответами и файл с промптом. Изображения - минимальные файлы с заголовком JPEG,
+итераторы их содержимое не читают.
+"""
+import os
+import json
+import random
+
+# Начало и конец JPEG-файла, этого достаточно, чтобы файл выглядел как изображение
+_FAKE_JPEG = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\xff\xd9"
+
+VQA_DOC_CLASSES = ["passport", "snils", "inn", "driver_license", "invoice"]
+VQA_QUESTION_TYPES = ["number", "date", "name", "address"]
+
+RPO_PROMPT_FILE_NAME = "prompt.txt"
+RPO_PROMPT_DIR_NAME = "prompts"
+
+# Маркер с параметрами генерации, чтобы не пересоздавать датасет при повторном запуске
+_MARKER_NAME = ".synthetic.json"
+
+
+def _is_generated(dataset_dir_path: str, params: dict) -> bool:
+    marker_path = os.path.join(dataset_dir_path, _MARKER_NAME)
+    if not os.path.exists(marker_path):
+        return False
+    with open(marker_path, "r", encoding="utf-8") as f:
+        return json.load(f) == params
+
+
+def _mark_generated(dataset_dir_path: str, params: dict) -> None:
+    with open(os.path.join(dataset_dir_path, _MARKER_NAME), "w", encoding="utf-8") as f:
+        json.dump(params, f)
+
+
+def generate_vqa_dataset(dataset_dir_path: str, num_rows: int, num_images: int = 1000,
+                         csv_name: str = "annotations.csv", seed: int = 0) -> str:
+    """Создаёт датасет VQA с заданным числом строк в аннотации.
+
+    Строки ссылаются на num_images изображений по кругу, поэтому число файлов на диске
+    не растёт вместе с размером таблицы.
+
+    Аргументы:
+        dataset_dir_path (str): Директория датасета.
+        num_rows (int): Количество строк в аннотации.
+        num_images (int): Количество файлов изображений. По умолчанию 1000.
+        csv_name (str): Имя CSV-файла с аннотацией. По умолчанию "annotations.csv".
+        seed (int): Зерно генератора случайных чисел. По умолчанию 0.
+
+    Возвращает:
+        str: Путь к директории датасета.
+    """
+    params = {"kind": "vqa", "num_rows": num_rows, "num_images": num_images, "csv_name": csv_name, "seed": seed}
+    if _is_generated(dataset_dir_path, params):
+        return dataset_dir_path
+
+    images_dir = os.path.join(dataset_dir_path, "images")
+    os.makedirs(images_dir, exist_ok=True)
+    for i in range(num_images):
+        with open(os.path.join(images_dir, f"{i}.jpg"), "wb") as f:
+            f.write(_FAKE_JPEG)
+
+    rng = random.Random(seed)
+    with open(os.path.join(dataset_dir_path, csv_name), "w", encoding="utf-8", newline="") as f:
+        f.write("image_path;question;answer;doc_class;question_type\n")
+        lines = []
+        for i in range(num_rows):
+            doc_class = rng.choice(VQA_DOC_CLASSES)
+            question_type = rng.choice(VQA_QUESTION_TYPES)
+            lines.append(f"images/{i % num_images}.jpg;What is the {question_type} in this {doc_class}?;"
+                         f"answer {i};{doc_class};{question_type}\n")
+            if len(lines) == 100_000:
+                f.writelines(lines)
+                lines = []
+        f.writelines(lines)
+
+    _mark_generated(dataset_dir_path, params)
+    return dataset_dir_path
+
+
+def generate_rpo_dataset(dataset_dir_path: str, num_bundles: int, pages_per_bundle: int = 6,
+                         seed: int = 0) -> str:
+    """Создаёт датасет RPO с заданным числом пачек документов.
+
+    Аргументы:
+        dataset_dir_path (str): Директория датасета.
+        num_bundles (int): Количество пачек документов.
+        pages_per_bundle (int): Количество страниц (изображений) в пачке. По умолчанию 6.
+        seed (int): Зерно генератора случайных чисел. По умолчанию 0.
+
+    Возвращает:
+        str: Путь к директории датасета.
+    """
+    params = {"kind": "rpo", "num_bundles": num_bundles, "pages_per_bundle": pages_per_bundle, "seed": seed}
+    if _is_generated(dataset_dir_path, params):
+        return dataset_dir_path
+
+    rng = random.Random(seed)
+    images_dir = os.path.join(dataset_dir_path, "images")
+    jsons_dir = os.path.join(dataset_dir_path, "jsons")
+    prompts_dir = os.path.join(dataset_dir_path, RPO_PROMPT_DIR_NAME)
+    os.makedirs(jsons_dir, exist_ok=True)
+    os.makedirs(prompts_dir, exist_ok=True)
+
+    with open(os.path.join(prompts_dir, RPO_PROMPT_FILE_NAME), "w", encoding="utf-8") as f:
+        f.write("Определи класс каждой страницы документа.")
+
+    for bundle_id in range(num_bundles):
+        bundle_dir = os.path.join(images_dir, str(bundle_id))
+        os.makedirs(bundle_dir, exist_ok=True)
+        for page in range(pages_per_bundle):
+            with open(os.path.join(bundle_dir, f"{page}.jpg"), "wb") as f:
+                f.write(_FAKE_JPEG)
+        answer = {str(page): rng.randint(1, 5) for page in range(pages_per_bundle)}
+        with open(os.path.join(jsons_dir, f"{bundle_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(answer, f)
+
+    _mark_generated(dataset_dir_path, params)
+    return dataset_dir_path
@@ -1,27 +1,65 @@
 import os
+import csv
+import time
+import traceback
+import threading
 from datetime import datetime
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Any
+from dataclasses import dataclass, astuple, fields
+from typing import TypeVar, Any, Callable, Optional
 
 from .abstract_iterator import AbstractIterator, TSample
+from .answer_sink import ANSWER_SINKS, CSV_SEPARATOR, get_answer_sink
 
 TIterator = TypeVar('TIterator', bound=AbstractIterator)
 
 
+# Значение, которое predict возвращает, если модель не дала ответ. None не подходит: модель может вернуть его как ответ
+MODEL_FAILED = object()
+
+
+class ModelTimeoutError(TimeoutError):
+    """Модель не ответила за отведённое время, и её вызов всё ещё выполняется в фоновом потоке."""
+
+
+@dataclass
+class ModelError:
+    """Класс, представляющий сэмпл, на котором модель не смогла дать ответ после всех попыток.
+
+    Атрибуты:
+        sample_id (int): Идентификатор сэмпла.
+        attempts (int): Количество сделанных попыток.
+        error_type (str): Название класса последнего исключения.
+        error_message (str): Текст последнего исключения.
+        traceback (str): Трассировка последнего исключения.
+    """
+    sample_id: int
+    attempts: int
+    error_type: str
+    error_message: str
+    traceback: str
+
+
 class AbstractDatasetRunner(ABC):
     """Абстрактный класс, реализующий логику прогона модели по датасету.
 
     Атрибуты:
         iterator (TIterator): Итератор, который предоставляет доступ к данным датасета.
         model (ModelInterface): VLM-модель, которая будет использоваться для получения ответа.
-        model_answers (list): Список для хранения ответов модели.
+        model_answers (list): Список для хранения ответов модели. Ответы должны иметь поля sample_id и model_answer.
         answers_dir_path (str): Путь к директории для сохранения ответов. По умолчанию "/workspace/answers".
         csv_name (str): Имя CSV-файла для сохранения ответов. По умолчанию "annotation.csv".
+        model_errors (list[ModelError]): Журнал сэмплов, на которых модель не дала ответ.
+        timeout (Optional[float]): Ограничение времени одного вызова модели в секундах. По умолчанию None - без ограничения.
+        max_retries (int): Количество повторных вызовов модели после ошибки. По умолчанию 0.
+        retry_delay (float): Задержка перед первым повтором в секундах, удваивается с каждой попыткой. По умолчанию 1.0.
+        answers_format (str): Формат файла с ответами: "csv", "jsonl" или "parquet". По умолчанию "csv".
     """
 
     def __init__(self, iterator: TIterator, model: Any, answers_dir_path: str = "/workspace/answers", 
-                 csv_name: str = None) -> None:
+                 csv_name: str = None, timeout: Optional[float] = None, max_retries: int = 0,
+                 retry_delay: float = 1.0, answers_format: str = "csv") -> None:
         """Инициализирует экземпляр AbstractDatasetRunner.
 
         Аргументы:
@@ -29,12 +67,108 @@ class AbstractDatasetRunner(ABC):
             model (ModelInterface): VLM-модель, которая будет использоваться для получения ответа.
             answers_dir_path (str): Путь к директории для сохранения ответов. По умолчанию "/workspace/answers".
             csv_name (str): Имя CSV-файла для сохранения ответов. По умолчанию None и задаётся динамически согласно атрибутам класса.
+            timeout (Optional[float]): Ограничение времени одного вызова модели в секундах. По умолчанию None - без ограничения.
+            max_retries (int): Количество повторных вызовов модели после ошибки. По умолчанию 0.
+            retry_delay (float): Задержка перед первым повтором в секундах. По умолчанию 1.0.
+            answers_format (str): Формат файла с ответами: "csv", "jsonl" или "parquet". По умолчанию "csv".
+
+        Выбрасывает:
+            ValueError: Если формат файла с ответами не поддерживается или параметры вызова модели вне допустимых значений.
         """
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be non-negative, got {max_retries}!")
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {timeout}!")
+        if answers_format not in ANSWER_SINKS:
+            raise ValueError(f"Answers format '{answers_format}' is not supported! "
+                             f"Use one of: {', '.join(ANSWER_SINKS)}")
         self.iterator = iterator
         self.model = model
         self.model_answers = []
         self.answers_dir_path = answers_dir_path
         self.csv_name = csv_name
+        self.model_errors = []
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.answers_format = answers_format
+        # Поток с вызовом модели, который не завершился за self.timeout
+        self._pending_call: Optional[threading.Thread] = None
+
+    def _call_with_timeout(self, predict: Callable[..., Any], *args: Any) -> Any:
+        """Вызывает модель, ограничивая время ответа self.timeout.
+
+        Зависший вызов нельзя прервать, поэтому он остаётся в фоновом потоке, который
+        не мешает завершению процесса. Пока он выполняется, новые вызовы модели не начинаются:
+        модель может быть не потокобезопасной, и параллельные вызовы заняли бы лишнюю память.
+
+        Выбрасывает:
+            ModelTimeoutError: Если модель не ответила за self.timeout секунд или за это время
+                не завершился её предыдущий зависший вызов.
+        """
+        if self.timeout is None:
+            return predict(*args)
+
+        if self._pending_call is not None:
+            self._pending_call.join(self.timeout)
+            if self._pending_call.is_alive():
+                raise ModelTimeoutError(f"Previous model call is still running after {self.timeout} s")
+            self._pending_call = None
+
+        result = {}
+
+        def target() -> None:
+            try:
+                result["answer"] = predict(*args)
+            except BaseException as e:
+                result["error"] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(self.timeout)
+        if thread.is_alive():
+            self._pending_call = thread
+            raise ModelTimeoutError(f"Model did not answer in {self.timeout} s")
+        if "error" in result:
+            raise result["error"]
+        return result["answer"]
+
+    def predict(self, sample: TSample, predict: Callable[..., Any], *args: Any) -> Any:
+        """Вызывает модель на сэмпле с ограничением времени и повторами при ошибках.
+
+        Если все попытки завершились ошибкой, сэмпл записывается в журнал self.model_errors,
+        и прогон продолжается со следующего сэмпла. После превышения времени вызов не повторяется,
+        так как предыдущий вызов модели ещё выполняется.
+
+        Аргументы:
+            sample (TSample): Сэмпл из датасета.
+            predict (Callable[..., Any]): Метод модели, например self.model.predict_on_image.
+            *args: Аргументы метода модели.
+
+        Возвращает:
+            Any: Ответ модели или MODEL_FAILED, если модель не дала ответ и сэмпл записан в журнал.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._call_with_timeout(predict, *args)
+            except Exception as e:
+                error = e
+                error_traceback = traceback.format_exc()
+                if isinstance(e, ModelTimeoutError):
+                    break
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_delay * 2 ** attempt)
+
+        self.model_errors.append(
+            ModelError(
+                sample.id,
+                attempt + 1,
+                type(error).__name__,
+                str(error),
+                error_traceback
+            )
+        )
+        return MODEL_FAILED
 
     @abstractmethod
     def run(self) -> None:
@@ -64,14 +198,52 @@ class AbstractDatasetRunner(ABC):
         timestamp = datetime.now().strftime(r"%Y%m%d_%H%M%S")  # Формат: ГГГГММДД_ЧЧММСС
         save_path = os.path.join(
             self.answers_dir_path,
-            f"{self.iterator.dataset_name}_{self.model.framework}_{self.model.model_name}_{self.iterator.task_name}_answers_{timestamp}.csv"
+            f"{self.iterator.dataset_name}_{self.model.framework}_{self.model.model_name}_{self.iterator.task_name}_answers_{timestamp}.{self.answers_extension}"
         )
         return save_path
 
-    @abstractmethod
-    def save_answers(self) -> str:
-        """Сохраняет ответы в CSV-файл под названием csv_name по пути self.answers_dir_path.
-        Возвращает путь до сохранённого файла с ответами модели.
-        Этот метод должен быть реализован в подклассах.
+    @property
+    def answers_extension(self) -> str:
+        """Расширение файла с ответами для формата self.answers_format."""
+        return ANSWER_SINKS[self.answers_format].extension
+
+    def save_answers(self) -> Optional[str]:
+        """Сохраняет ответы в файл формата self.answers_format по пути self.answers_dir_path с добавлением timestamp в название файла.
+
+        Все раннеры пишут одну схему: столбцы sample_id и model_answer. Если список ответов пуст,
+        выводит предупреждение и не сохраняет файл.
+
+        Возвращает:
+            Optional[str]: Путь до сохранённого файла с ответами модели.
         """
-        pass
\ No newline at end of file
+        if not self.model_answers:
+            print("Нет ответов для сохранения.")
+            return
+
+        # Создаем путь для сохранения файла с timestamp
+        save_path = self.get_answer_filename()
+
+        # Пишем записи потоком, без промежуточного DataFrame
+        get_answer_sink(self.answers_format, save_path).write(
+            (answer.sample_id, answer.model_answer) for answer in self.model_answers
+        )
+        return save_path
+
+    def save_errors(self) -> Optional[str]:
+        """Сохраняет журнал сэмплов, на которых модель не дала ответ, в CSV-файл рядом с ответами.
+
+        По столбцу sample_id журнала можно повторить прогон только на этих сэмплах
+        командой `dataset-iterator retry`.
+
+        Возвращает:
+            Optional[str]: Путь до сохранённого журнала или None, если ошибок не было.
+        """
+        if not self.model_errors:
+            return None
+
+        save_path = os.path.splitext(self.get_answer_filename())[0] + "_errors.csv"
+        with open(save_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f, delimiter=CSV_SEPARATOR)
+            writer.writerow([field.name for field in fields(ModelError)])
+            writer.writerows(astuple(error) for error in self.model_errors)
+        return save_path
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import TypeVar, Optional
+from typing import List, TypeVar, Optional
+
+from .image_pack import ImagePack
 
 
 @dataclass
@@ -28,11 +30,20 @@ class AbstractIterator(ABC):
         filter_question_type (Optional[str]): Фильтр для типа вопроса. По умолчанию None.
         dataset_dir_path (str): Путь к директории с датасетом. По умолчанию '/data'.
         csv_name (str): Имя CSV-файла с аннотацией данных. По умолчанию 'annotation.csv'.
+        index_path (Optional[str]): Путь к индексу датасета, построенному командой `dataset-iterator index`. По умолчанию None.
+        image_pack_path (Optional[str]): Путь к индексу pack-файлов с изображениями, построенному командой `dataset-iterator pack`. По умолчанию None.
+        sample_size (Optional[int]): Размер случайной выборки из датасета. По умолчанию None - весь датасет.
+        sample_fraction (Optional[float]): Доля случайной выборки из датасета. По умолчанию None - весь датасет.
+        sample_seed (int): Зерно генератора случайных чисел для выборки. По умолчанию 0.
+        stratify_by (Optional[List[str]]): Поля, по которым стратифицируется выборка. По умолчанию None.
     """
 
     def __init__(self, task_name: str, dataset_name: str, start: int = 0, 
                  filter_doc_class: Optional[str] = None, filter_question_type: Optional[str] = None, 
-                 dataset_dir_path: str = '/data', csv_name: str = 'annotation.csv', *args, **kwargs) -> None:
+                 dataset_dir_path: str = '/data', csv_name: str = 'annotation.csv',
+                 index_path: Optional[str] = None, image_pack_path: Optional[str] = None,
+                 sample_size: Optional[int] = None, sample_fraction: Optional[float] = None, sample_seed: int = 0,
+                 stratify_by: Optional[List[str]] = None, *args, **kwargs) -> None:
         """Инициализирует экземпляр AbstractIterator.
 
         Аргументы:
@@ -43,6 +54,13 @@ class AbstractIterator(ABC):
             filter_question_type (Optional[str]): Фильтр для типа вопроса. По умолчанию None.
             dataset_dir_path (str): Путь к директории с датасетом. По умолчанию '/data'.
             csv_name (str): Имя CSV-файла с аннотацией данных. По умолчанию 'annotation.csv'.
+            index_path (Optional[str]): Путь к индексу датасета. Если задан, данные читаются по индексу. По умолчанию None.
+            image_pack_path (Optional[str]): Путь к индексу pack-файлов. Если задан, вместо путей к изображениям
+                сэмплы содержат байты изображений в виде memoryview. По умолчанию None.
+            sample_size (Optional[int]): Размер случайной выборки из датасета. По умолчанию None.
+            sample_fraction (Optional[float]): Доля случайной выборки из датасета, из (0, 1]. По умолчанию None.
+            sample_seed (int): Зерно генератора случайных чисел для выборки. По умолчанию 0.
+            stratify_by (Optional[List[str]]): Поля, по которым стратифицируется выборка. По умолчанию None.
         """
         self.dataset_name = dataset_name
         self.row_index = start
@@ -52,6 +70,18 @@ class AbstractIterator(ABC):
         self.dataset_dir_path = dataset_dir_path
         # TODO: csv_name - VQA only
         self.csv_name = csv_name
+        self.index_path = index_path
+        self.image_pack_path = image_pack_path
+        self.image_pack = ImagePack(image_pack_path) if image_pack_path else None
+        self.sample_size = sample_size
+        self.sample_fraction = sample_fraction
+        self.sample_seed = sample_seed
+        self.stratify_by = stratify_by
+
+    @property
+    def is_sampled(self) -> bool:
+        """Задана ли выборка из датасета вместо итерирования по всем сэмплам."""
+        return self.sample_size is not None or self.sample_fraction is not None
 
     @abstractmethod
     def _read_data(self) -> None:
@@ -61,6 +91,21 @@ class AbstractIterator(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """Освобождает ресурсы итератора: закрывает pack-файлы с изображениями, если они открыты.
+
+        Выбрасывает:
+            BufferError: Если байты изображений из pack-файлов ещё используются.
+        """
+        if self.image_pack is not None:
+            self.image_pack.close()
+
+    def __enter__(self) -> 'AbstractIterator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def __iter__(self) -> 'AbstractIterator':
         """Возвращает итератор для обхода датасета.
 
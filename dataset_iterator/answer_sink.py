@@ -0,0 +1,192 @@
+import os
+import csv
+import json
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Type
+
+# Единая схема файла с ответами модели для всех раннеров
+ANSWER_FIELDS = ("sample_id", "model_answer")
+
+# Одна запись - кортеж (sample_id, model_answer)
+TAnswerRecord = Tuple[int, str]
+
+CSV_SEPARATOR = ";"
+
+# Размер пачки записей, которая собирается в памяти перед записью в Parquet
+_PARQUET_BATCH_SIZE = 1_000_000
+
+# Названия столбцов в файлах, сохранённых до появления единой схемы
+_LEGACY_FIELDS = {"id": "sample_id", "answer": "model_answer"}
+
+
+def _answer_text(answer) -> str:
+    """Приводит ответ модели к строке. Отсутствующий ответ (None) во всех форматах записывается пустой строкой."""
+    return "" if answer is None else str(answer)
+
+
+class AnswerSink(ABC):
+    """Абстрактный класс для записи ответов модели в файл.
+
+    Записи передаются кортежами (sample_id, model_answer) и пишутся в файл потоком,
+    без промежуточного DataFrame.
+
+    Атрибуты:
+        path (str): Путь к файлу с ответами.
+        extension (str): Расширение файла, по которому формат определяется при чтении.
+    """
+
+    extension: str
+
+    def __init__(self, path: str) -> None:
+        """Инициализирует экземпляр AnswerSink.
+
+        Аргументы:
+            path (str): Путь к файлу с ответами.
+        """
+        self.path = path
+
+    @abstractmethod
+    def write(self, records: Iterable[TAnswerRecord]) -> None:
+        """Записывает ответы в файл.
+
+        Аргументы:
+            records (Iterable[TAnswerRecord]): Кортежи (sample_id, model_answer).
+
+        Этот метод должен быть реализован в подклассах.
+        """
+        pass
+
+
+class CSVAnswerSink(AnswerSink):
+    """Запись ответов в CSV-файл с разделителем ";" и кодировкой utf-8-sig."""
+
+    extension = "csv"
+
+    def write(self, records: Iterable[TAnswerRecord]) -> None:
+        with open(self.path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f, delimiter=CSV_SEPARATOR)
+            writer.writerow(ANSWER_FIELDS)
+            writer.writerows((sample_id, _answer_text(answer)) for sample_id, answer in records)
+
+
+class JSONLAnswerSink(AnswerSink):
+    """Запись ответов в JSONL-файл: по одному JSON-объекту на строку."""
+
+    extension = "jsonl"
+
+    def write(self, records: Iterable[TAnswerRecord]) -> None:
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.writelines(
+                f'{{"sample_id": {int(sample_id)}, "model_answer": {dumps(_answer_text(answer))}}}\n'
+                for sample_id, answer in records
+            )
+
+
+class ParquetAnswerSink(AnswerSink):
+    """Запись ответов в Parquet-файл. Требует установленный pyarrow."""
+
+    extension = "parquet"
+
+    def write(self, records: Iterable[TAnswerRecord]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Saving answers to Parquet requires pyarrow: pip install pyarrow") from e
+
+        schema = pa.schema([("sample_id", pa.int64()), ("model_answer", pa.string())])
+        records = iter(records)
+        with pq.ParquetWriter(self.path, schema) as writer:
+            while True:
+                batch = list(islice(records, _PARQUET_BATCH_SIZE))
+                if not batch:
+                    break
+                sample_ids, answers = zip(*batch)
+                writer.write_table(pa.table([pa.array(sample_ids, pa.int64()),
+                                             pa.array(map(_answer_text, answers), pa.string())], schema=schema))
+
+
+ANSWER_SINKS: Dict[str, Type[AnswerSink]] = {
+    "csv": CSVAnswerSink,
+    "jsonl": JSONLAnswerSink,
+    "parquet": ParquetAnswerSink,
+}
+
+
+def get_answer_sink(answers_format: str, path: str) -> AnswerSink:
+    """Возвращает объект для записи ответов в указанном формате.
+
+    Аргументы:
+        answers_format (str): Формат файла: "csv", "jsonl" или "parquet".
+        path (str): Путь к файлу с ответами.
+
+    Возвращает:
+        AnswerSink: Объект для записи ответов.
+
+    Выбрасывает:
+        ValueError: Если формат не поддерживается.
+    """
+    if answers_format not in ANSWER_SINKS:
+        raise ValueError(f"Answers format '{answers_format}' is not supported! "
+                         f"Use one of: {', '.join(ANSWER_SINKS)}")
+    return ANSWER_SINKS[answers_format](path)
+
+
+def _read_csv_answers(path: str) -> Iterator[TAnswerRecord]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter=CSV_SEPARATOR)
+        header = [_LEGACY_FIELDS.get(column.strip(), column.strip()) for column in next(reader, [])]
+        id_idx, answer_idx = header.index("sample_id"), header.index("model_answer")
+        for row in reader:
+            if row:
+                yield int(row[id_idx]), row[answer_idx]
+
+
+def _read_jsonl_answers(path: str) -> Iterator[TAnswerRecord]:
+    loads = json.loads
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = loads(line)
+                yield int(record["sample_id"]), record["model_answer"]
+
+
+def _read_parquet_answers(path: str) -> Iterator[TAnswerRecord]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading answers from Parquet requires pyarrow: pip install pyarrow") from e
+
+    for batch in pq.ParquetFile(path).iter_batches(columns=list(ANSWER_FIELDS)):
+        yield from zip(batch.column(0).to_pylist(), batch.column(1).to_pylist())
+
+
+_ANSWER_READERS = {
+    "csv": _read_csv_answers,
+    "jsonl": _read_jsonl_answers,
+    "parquet": _read_parquet_answers,
+}
+
+
+def read_answers(path: str, answers_format: Optional[str] = None) -> Iterator[TAnswerRecord]:
+    """Читает файл с ответами модели, сохранённый раннером.
+
+    Файлы CSV, сохранённые до появления единой схемы (со столбцами id или answer), тоже читаются.
+
+    Аргументы:
+        path (str): Путь к файлу с ответами.
+        answers_format (Optional[str]): Формат файла. По умолчанию определяется по расширению.
+
+    Возвращает:
+        Iterator[TAnswerRecord]: Кортежи (sample_id, model_answer) в порядке записи.
+
+    Выбрасывает:
+        ValueError: Если формат не поддерживается.
+    """
+    answers_format = answers_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if answers_format not in _ANSWER_READERS:
+        raise ValueError(f"Answers format '{answers_format}' is not supported! "
+                         f"Use one of: {', '.join(_ANSWER_READERS)}")
+    return _ANSWER_READERS[answers_format](path)
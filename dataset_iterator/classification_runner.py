@@ -1,10 +1,8 @@
 import os
-import pandas as pd
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from tqdm import tqdm
+from dataclasses import dataclass
 
-from .abstract_dataset_runner import AbstractDatasetRunner
+from .abstract_dataset_runner import MODEL_FAILED, AbstractDatasetRunner
 from .rpo_iterator import RPOSample
 
 
@@ -13,7 +11,7 @@ class ClassificationModelAnswer:
     """Класс, представляющий один ответ модели для задачи классификации на датасете RPO.
 
     Атрибуты:
-        id (int): Уникальный идентификатор ответа, соответствующий идентификатору сэмпла.
+        sample_id (int): Уникальный идентификатор ответа, соответствующий идентификатору сэмпла.
         model_answer (str): Текст ответа модели.
     """
     sample_id: int
@@ -35,12 +33,18 @@ class ClassificationRunner(AbstractDatasetRunner):
         """Осуществляет прогон модели по датасету RPO и проводит классификацию модели.
 
         Проходит по всем сэмплам в итераторе, получает ответы модели и сохраняет их.
+        Сэмплы, на которых модель не дала ответ, попадают в журнал self.model_errors.
         """
+        from tqdm import tqdm
+
         row: RPOSample
         for row in tqdm(self.iterator):
-            answer_cls = self.model.predict_on_images(row.images, row.prompt)
+            answer_cls = self.predict(row, self.model.predict_on_images, row.images, row.prompt)
+            if answer_cls is MODEL_FAILED:
+                continue
             # ответ в формате  "2,2,5,5,3", убираем запятые
-            answer_cls = answer_cls.replace(",", "")
+            if answer_cls is not None:
+                answer_cls = answer_cls.replace(",", "")
             self.add_answer(row, answer_cls)
 
     def add_answer(self, sample: RPOSample, answer: str) -> None:
@@ -65,25 +69,6 @@ class ClassificationRunner(AbstractDatasetRunner):
         timestamp = datetime.now().strftime(r"%Y%m%d_%H%M%S")  # Формат: ГГГГММДД_ЧЧММСС
         save_path = os.path.join(
             self.answers_dir_path,
-            f"{self.iterator.dataset_name}_MODELFRAMEWORK_{self.model.model_name}_{self.iterator.task_name}_classification_answers_{timestamp}.csv"
+            f"{self.iterator.dataset_name}_MODELFRAMEWORK_{self.model.model_name}_{self.iterator.task_name}_classification_answers_{timestamp}.{self.answers_extension}"
         )
         return save_path
-
-    def save_answers(self) -> str:
-        """Сохраняет ответы в CSV-файл по пути self.answers_dir_path с добавлением timestamp в название файла.
-
-        Если список ответов пуст, выводит предупреждение и не сохраняет файл.
-        """
-        if not self.model_answers:
-            print("Нет ответов для сохранения.")
-            return
-
-        # Преобразуем список ответов в DataFrame
-        answers_df = pd.DataFrame([asdict(answer) for answer in self.model_answers])
-
-        # Создаем путь для сохранения файла с timestamp
-        save_path = self.get_answer_filename()
-
-        # Сохраняем DataFrame в CSV
-        answers_df.to_csv(save_path, index=False, sep=";", encoding='utf-8-sig')
-        return save_path
@@ -0,0 +1,394 @@
+"""Консольная точка входа `dataset-iterator`.
+
+Тяжёлые зависимости (pandas, tqdm, prompt_adapter) импортируются только внутри команд,
+которым они нужны, поэтому `--help` и `index` запускаются без них.
+"""
+import os
+import csv
+import sys
+import json
+import argparse
+import importlib
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from .answer_sink import CSV_SEPARATOR, read_answers
+
+
+def load_config(config_path: str) -> dict:
+    """Читает JSON-конфиг прогона.
+
+    Конфиг содержит секции:
+        iterator (dict): Аргументы IteratorFabric.get_dataset_iterator (обязательна).
+        model (dict): Класс модели в виде "module:ClassName" в ключе "class" и аргументы
+            конструктора в ключах "args" и "kwargs".
+        runner (dict): Аргументы IteratorFabric.get_runner, кроме iterator и model.
+
+    Аргументы:
+        config_path (str): Путь к конфигу.
+
+    Возвращает:
+        dict: Содержимое конфига.
+
+    Выбрасывает:
+        ValueError: Если в конфиге нет секции iterator.
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if "iterator" not in config:
+        raise ValueError(f"Config '{config_path}' has no 'iterator' section!")
+    return config
+
+
+def load_object(path: str) -> Any:
+    """Импортирует объект по строке вида "package.module:Name".
+
+    Текущая директория добавляется в sys.path, чтобы можно было указывать модули рядом с конфигом.
+
+    Аргументы:
+        path (str): Путь к объекту.
+
+    Возвращает:
+        Any: Импортированный объект.
+    """
+    module_name, _, attr = path.partition(":")
+    if not attr:
+        raise ValueError(f"Object path '{path}' must look like 'module:Name'!")
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    obj = importlib.import_module(module_name)
+    for name in attr.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def build_model(config: dict) -> Any:
+    """Создаёт модель по секции model конфига.
+
+    Аргументы:
+        config (dict): Конфиг прогона.
+
+    Возвращает:
+        Any: Экземпляр модели.
+    """
+    model_config = config.get("model")
+    if not model_config or "class" not in model_config:
+        raise ValueError("Config has no 'model.class' entry!")
+    model_cls = load_object(model_config["class"])
+    return model_cls(*model_config.get("args", []), **model_config.get("kwargs", {}))
+
+
+class _FilteredIterator:
+    """Обёртка над итератором датасета, пропускающая часть сэмплов.
+
+    Атрибуты итератора (dataset_name, task_name и др.) доступны через обёртку, поэтому
+    её можно передавать в раннеры вместо исходного итератора.
+
+    Атрибуты:
+        iterator (TIterator): Исходный итератор.
+        skip_ids (Set[int]): Идентификаторы сэмплов, которые нужно пропустить.
+        only_ids (Optional[Set[int]]): Если задано, возвращаются только сэмплы с этими идентификаторами.
+        num_shards (int): Количество шардов.
+        shard_index (int): Номер шарда, сэмплы которого возвращаются.
+    """
+
+    def __init__(self, iterator, skip_ids: Optional[Set[int]] = None, only_ids: Optional[Set[int]] = None,
+                 num_shards: int = 1, shard_index: int = 0) -> None:
+        self.iterator = iterator
+        self.skip_ids = skip_ids or set()
+        self.only_ids = only_ids
+        self.num_shards = num_shards
+        self.shard_index = shard_index
+        self._position = -1
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.iterator, name)
+
+    def __iter__(self) -> '_FilteredIterator':
+        return self
+
+    def __next__(self):
+        while True:
+            sample = next(self.iterator)
+            self._position += 1
+            if self._position % self.num_shards != self.shard_index:
+                continue
+            if sample.id in self.skip_ids:
+                continue
+            if self.only_ids is not None and sample.id not in self.only_ids:
+                continue
+            return sample
+
+
+def read_error_ids(errors_path: str) -> Set[int]:
+    """Читает идентификаторы сэмплов из журнала ошибок, сохранённого раннером.
+
+    Аргументы:
+        errors_path (str): Путь к журналу ошибок.
+
+    Возвращает:
+        Set[int]: Идентификаторы сэмплов, на которых модель не дала ответ.
+    """
+    with open(errors_path, "r", encoding="utf-8-sig", newline="") as f:
+        return {int(row["sample_id"]) for row in csv.DictReader(f, delimiter=CSV_SEPARATOR)}
+
+
+def _run(config: dict, iterator_wrapper=None, answers_dir_path: Optional[str] = None) -> Optional[str]:
+    """Создаёт итератор, модель и раннер по конфигу, проводит прогон и сохраняет ответы.
+
+    Возвращает:
+        Optional[str]: Путь к сохранённому файлу с ответами или None, если ответов нет.
+    """
+    from .fabrics import IteratorFabric
+
+    iterator = IteratorFabric.get_dataset_iterator(**config["iterator"])
+    if iterator_wrapper:
+        iterator = iterator_wrapper(iterator)
+
+    runner_kwargs = dict(config.get("runner", {}))
+    if answers_dir_path:
+        runner_kwargs["answers_dir_path"] = answers_dir_path
+
+    try:
+        runner = IteratorFabric.get_runner(iterator=iterator, model=build_model(config), **runner_kwargs)
+        runner.run()
+        save_path = runner.save_answers()
+        if save_path:
+            print("Ответы сохранены в", save_path)
+        errors_path = runner.save_errors()
+        if errors_path:
+            print(f"Модель не дала ответ на {len(runner.model_errors)} сэмплах, журнал сохранён в", errors_path)
+    finally:
+        _close_iterator(iterator)
+    return save_path
+
+
+def _close_iterator(iterator) -> None:
+    """Закрывает pack-файлы с изображениями итератора. У итераторов из плагинов метода close может не быть.
+
+    Если байты изображений ещё используются, например зависшим вызовом модели в фоновом потоке,
+    pack-файлы остаются открытыми до завершения процесса, а вместо ошибки выводится предупреждение.
+    """
+    close = getattr(iterator, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except BufferError as e:
+        print(f"dataset-iterator: warning: {e}", file=sys.stderr)
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """Прогон модели по датасету или по выборке из него."""
+    config = load_config(args.config)
+    # Параметры выборки из командной строки перекрывают заданные в конфиге
+    sampling = {
+        "sample_size": args.sample_size,
+        "sample_fraction": args.sample_fraction,
+        "sample_seed": args.sample_seed,
+        "stratify_by": args.stratify_by,
+    }
+    config["iterator"].update({key: value for key, value in sampling.items() if value is not None})
+    _run(config)
+    return 0
+
+
+def cmd_resume(args: argparse.Namespace) -> int:
+    """Продолжает прогон, пропуская сэмплы, ответы на которые уже есть в файлах args.answers."""
+    done_ids = set()
+    for answers_path in args.answers:
+        done_ids.update(sample_id for sample_id, _ in read_answers(answers_path))
+    print(f"Пропускаем {len(done_ids)} сэмплов с готовыми ответами.")
+    _run(load_config(args.config), lambda iterator: _FilteredIterator(iterator, skip_ids=done_ids))
+    return 0
+
+
+def cmd_retry(args: argparse.Namespace) -> int:
+    """Повторяет прогон только на сэмплах из журналов ошибок args.errors."""
+    failed_ids = set()
+    for errors_path in args.errors:
+        failed_ids.update(read_error_ids(errors_path))
+    print(f"Повторяем прогон на {len(failed_ids)} сэмплах.")
+    _run(load_config(args.config), lambda iterator: _FilteredIterator(iterator, only_ids=failed_ids))
+    return 0
+
+
+def cmd_shard(args: argparse.Namespace) -> int:
+    """Прогон модели по одному шарду датасета."""
+    if not 0 <= args.shard_index < args.num_shards:
+        raise ValueError(f"Shard index must be in [0, {args.num_shards})!")
+    config = load_config(args.config)
+    answers_dir_path = os.path.join(
+        config.get("runner", {}).get("answers_dir_path", "/workspace/answers"),
+        f"shard_{args.shard_index}_of_{args.num_shards}",
+    )
+    _run(config,
+         lambda iterator: _FilteredIterator(iterator, num_shards=args.num_shards, shard_index=args.shard_index),
+         answers_dir_path)
+    return 0
+
+
+def cmd_index(args: argparse.Namespace) -> int:
+    """Строит индекс датасета для ускорения повторных запусков."""
+    from .dataset_index import build_index
+
+    iterator_config = load_config(args.config)["iterator"]
+    index_path = build_index(
+        iterator_config["task_name"],
+        iterator_config.get("dataset_dir_path", "/data"),
+        iterator_config.get("csv_name", "annotation.csv"),
+        index_dir_path=args.output_dir,
+    )
+    print("Индекс сохранён в", index_path)
+    return 0
+
+
+def cmd_pack(args: argparse.Namespace) -> int:
+    """Упаковывает изображения датасета в pack-файлы."""
+    from .image_pack import pack_images
+
+    iterator_config = load_config(args.config)["iterator"]
+    index_path = pack_images(
+        iterator_config.get("dataset_dir_path", "/data"),
+        output_dir_path=args.output_dir,
+        max_pack_size=args.max_pack_size_mb * 1024 * 1024,
+    )
+    print("Индекс pack-файлов сохранён в", index_path)
+    return 0
+
+
+def _normalize_answer(answer: Any) -> str:
+    return " ".join(str(answer).split()).lower()
+
+
+def score_vqa(samples: Iterable, answers: Iterable[Tuple[int, str]]) -> dict:
+    """Считает точность ответов модели на датасете VQA по точному совпадению.
+
+    Ответы сравниваются без учёта регистра и лишних пробелов.
+
+    Аргументы:
+        samples (Iterable[VQASample]): Сэмплы датасета с правильными ответами.
+        answers (Iterable[Tuple[int, str]]): Ответы модели, прочитанные функцией read_answers.
+
+    Возвращает:
+        dict: Количество сэмплов, ответов, правильных ответов и точность.
+    """
+    model_answers = dict(answers)
+    total = answered = correct = 0
+    for sample in samples:
+        total += 1
+        model_answer = model_answers.get(sample.id)
+        if model_answer is None:
+            continue
+        answered += 1
+        correct += _normalize_answer(model_answer) == _normalize_answer(sample.answer)
+    return {
+        "total": total,
+        "answered": answered,
+        "correct": correct,
+        "accuracy": correct / answered if answered else 0.0,
+    }
+
+
+def cmd_score(args: argparse.Namespace) -> int:
+    """Считает метрики по файлу с ответами модели."""
+    iterator_config = load_config(args.config)["iterator"]
+    if iterator_config["task_name"] != "VQA":
+        raise ValueError(f"Scoring for task '{iterator_config['task_name']}' is not implemented!")
+
+    from .fabrics import IteratorFabric
+
+    answers = []
+    for answers_path in args.answers:
+        answers.extend(read_answers(answers_path))
+    # Для подсчёта метрик промпты не нужны
+    iterator_config = {k: v for k, v in iterator_config.items() if k != "prompt_collection_filename"}
+    metrics = score_vqa(IteratorFabric.get_dataset_iterator(**iterator_config), answers)
+    print(json.dumps(metrics, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_tasks(args: argparse.Namespace) -> int:
+    """Выводит названия задач и бэкенды итераторов и раннеров, зарегистрированные для них."""
+    from .fabrics import IteratorFabric
+
+    for task_name in IteratorFabric.get_task_names():
+        backends = IteratorFabric.get_backends(task_name)
+        # Задачу без итератора или без раннера запустить нельзя, показываем, чего не хватает
+        iterators = ','.join(backends['iterators']) or "(not registered)"
+        runners = ','.join(backends['runners']) or "(not registered)"
+        print(f"{task_name}: iterators={iterators} runners={runners}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки."""
+    parser = argparse.ArgumentParser(
+        prog="dataset-iterator",
+        description="Прогон VLM-модели по датасетам VQA и RPO.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Прогон модели по датасету.")
+    run_parser.add_argument("config", help="Путь к JSON-конфигу прогона.")
+    run_parser.add_argument("--sample-size", type=int, default=None, help="Прогон на случайной выборке такого размера.")
+    run_parser.add_argument("--sample-fraction", type=float, default=None,
+                            help="Прогон на случайной выборке такой доли датасета, например 0.01.")
+    run_parser.add_argument("--sample-seed", type=int, default=None, help="Зерно генератора для выборки.")
+    run_parser.add_argument("--stratify-by", nargs="+", choices=["doc_class", "question_type"], default=None,
+                            help="Поля, по которым стратифицируется выборка (только VQA).")
+    run_parser.set_defaults(func=cmd_run)
+
+    resume_parser = subparsers.add_parser("resume", help="Продолжение прерванного прогона.")
+    resume_parser.add_argument("config", help="Путь к JSON-конфигу прогона.")
+    resume_parser.add_argument("--answers", nargs="+", required=True,
+                               help="Файлы с уже полученными ответами.")
+    resume_parser.set_defaults(func=cmd_resume)
+
+    retry_parser = subparsers.add_parser("retry", help="Повторный прогон на сэмплах из журнала ошибок.")
+    retry_parser.add_argument("config", help="Путь к JSON-конфигу прогона.")
+    retry_parser.add_argument("--errors", nargs="+", required=True, help="Журналы ошибок предыдущих прогонов.")
+    retry_parser.set_defaults(func=cmd_retry)
+
+    shard_parser = subparsers.add_parser("shard", help="Прогон модели по одному шарду датасета.")
+    shard_parser.add_argument("config", help="Путь к JSON-конфигу прогона.")
+    shard_parser.add_argument("--num-shards", type=int, required=True, help="Количество шардов.")
+    shard_parser.add_argument("--shard-index", type=int, required=True, help="Номер шарда, начиная с 0.")
+    shard_parser.set_defaults(func=cmd_shard)
+
+    index_parser = subparsers.add_parser("index", help="Построение индекса датасета.")
+    index_parser.add_argument("config", help="Путь к JSON-конфигу прогона.")
+    index_parser.add_argument("--output-dir", default=None,
+                              help="Директория для индекса. По умолчанию директория датасета.")
+    index_parser.set_defaults(func=cmd_index)
+
+    pack_parser = subparsers.add_parser("pack", help="Упаковка изображений датасета в pack-файлы.")
+    pack_parser.add_argument("config", help="Путь к JSON-конфигу прогона.")
+    pack_parser.add_argument("--output-dir", default=None,
+                             help="Директория для pack-файлов. По умолчанию директория датасета.")
+    pack_parser.add_argument("--max-pack-size-mb", type=int, default=4096,
+                             help="Максимальный размер одного pack-файла в МиБ. По умолчанию 4096.")
+    pack_parser.set_defaults(func=cmd_pack)
+
+    score_parser = subparsers.add_parser("score", help="Подсчёт метрик по ответам модели.")
+    score_parser.add_argument("config", help="Путь к JSON-конфигу прогона.")
+    score_parser.add_argument("--answers", nargs="+", required=True, help="Файлы с ответами модели.")
+    score_parser.set_defaults(func=cmd_score)
+
+    tasks_parser = subparsers.add_parser("tasks", help="Список доступных задач.")
+    tasks_parser.set_defaults(func=cmd_tasks)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа консольной команды `dataset-iterator`."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"dataset-iterator: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+import os
+import csv
+import json
+import hashlib
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Модуль намеренно использует только стандартную библиотеку: построение индекса
+# запускается из консоли и не должно тянуть за собой pandas и prompt_adapter.
+
+INDEX_FORMAT_VERSION = 1
+
+VQA_INDEX_KIND = "vqa"
+RPO_INDEX_KIND = "rpo"
+
+RPO_INDEX_NAME = "rpo.index.json"
+
+# Название задачи -> тип индекса, который для неё строится
+TASK_INDEX_KINDS = {
+    "VQA": VQA_INDEX_KIND,
+    "RPOClassification": RPO_INDEX_KIND,
+    "RPOSorting": RPO_INDEX_KIND,
+}
+
+
+@dataclass
+class VQAIndex:
+    """Индекс CSV-файла с аннотацией датасета VQA.
+
+    Атрибуты:
+        csv_path (str): Путь к проиндексированному CSV-файлу.
+        sep (str): Разделитель столбцов CSV-файла.
+        columns (List[str]): Названия столбцов таблицы.
+        offsets (array): Смещения в байтах начала каждой строки данных (без заголовка).
+        strata (List[Tuple[str, str]]): Таблица уникальных пар (doc_class, question_type).
+        strata_codes (array): Номер пары из strata для каждой строки данных.
+    """
+    csv_path: str
+    sep: str
+    columns: List[str]
+    offsets: array
+    strata: List[Tuple[str, str]]
+    strata_codes: array
+
+    @property
+    def num_rows(self) -> int:
+        """Количество строк данных в таблице."""
+        return len(self.offsets)
+
+
+def get_vqa_index_path(dataset_dir_path: str, csv_name: str, index_dir_path: Optional[str] = None) -> str:
+    """Возвращает путь к файлу с метаданными индекса VQA.
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        csv_name (str): Имя CSV-файла с аннотацией данных.
+        index_dir_path (Optional[str]): Директория для индекса. По умолчанию совпадает с директорией датасета.
+    """
+    return os.path.join(index_dir_path or dataset_dir_path, f"{csv_name}.index.json")
+
+
+def get_cache_dir() -> str:
+    """Возвращает директорию для индексов, которые нельзя сохранить рядом с датасетом.
+
+    Задаётся переменной окружения DATASET_ITERATOR_CACHE_DIR, по умолчанию
+    $XDG_CACHE_HOME/dataset_iterator или ~/.cache/dataset_iterator.
+    """
+    cache_dir = os.environ.get("DATASET_ITERATOR_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg_cache_home, "dataset_iterator")
+
+
+def get_vqa_cache_index_dir(dataset_dir_path: str, csv_name: str) -> str:
+    """Возвращает директорию в кэше для индекса CSV-файла. Имя директории зависит от абсолютного пути к файлу.
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        csv_name (str): Имя CSV-файла с аннотацией данных.
+    """
+    csv_path = os.path.abspath(os.path.join(dataset_dir_path, csv_name))
+    return os.path.join(get_cache_dir(), hashlib.sha1(csv_path.encode("utf-8")).hexdigest()[:16])
+
+
+def get_rpo_index_path(dataset_dir_path: str, index_dir_path: Optional[str] = None) -> str:
+    """Возвращает путь к файлу индекса RPO.
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        index_dir_path (Optional[str]): Директория для индекса. По умолчанию совпадает с директорией датасета.
+    """
+    return os.path.join(index_dir_path or dataset_dir_path, RPO_INDEX_NAME)
+
+
+def _iter_csv_records(csv_file):
+    """Итерируется по записям CSV-файла, открытого в бинарном режиме.
+
+    Запись может занимать несколько физических строк, если в ней есть перевод строки
+    внутри кавычек, поэтому конец записи определяется по чётности числа кавычек.
+
+    Возвращает:
+        Итератор пар (смещение начала записи в байтах, байты записи).
+    """
+    offset = csv_file.tell()
+    record_offset = offset
+    record_parts = []
+    quotes = 0
+    for line in csv_file:
+        if not record_parts:
+            record_offset = offset
+        record_parts.append(line)
+        quotes += line.count(b'"')
+        offset += len(line)
+        if quotes % 2 == 0:
+            record = b"".join(record_parts)
+            record_parts = []
+            quotes = 0
+            if record.strip():
+                yield record_offset, record
+    if record_parts:
+        yield record_offset, b"".join(record_parts)
+
+
+def build_vqa_index(dataset_dir_path: str, csv_name: str = "annotation.csv", sep: str = ";",
+                    index_dir_path: Optional[str] = None, encoding: str = "utf-8") -> str:
+    """Строит индекс CSV-файла с аннотацией датасета VQA и сохраняет его на диск.
+
+    Индекс состоит из трёх файлов: метаданных в JSON, смещений строк и кодов пар
+    (doc_class, question_type) в бинарном виде.
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        csv_name (str): Имя CSV-файла с аннотацией данных. По умолчанию 'annotation.csv'.
+        sep (str): Разделитель столбцов. По умолчанию ";".
+        index_dir_path (Optional[str]): Директория для индекса. По умолчанию совпадает с директорией датасета.
+        encoding (str): Кодировка CSV-файла. По умолчанию "utf-8".
+
+    Возвращает:
+        str: Путь к файлу с метаданными индекса.
+    """
+    csv_path = os.path.join(dataset_dir_path, csv_name)
+    index_path = get_vqa_index_path(dataset_dir_path, csv_name, index_dir_path)
+
+    offsets = array("Q")
+    strata_codes = array("I")
+    strata: Dict[Tuple[str, str], int] = {}
+
+    with open(csv_path, "rb") as csv_file:
+        records = _iter_csv_records(csv_file)
+        _, header = next(records)
+        columns = next(csv.reader([header.decode(encoding).lstrip("\ufeff")], delimiter=sep))
+        columns = [column.strip() for column in columns]
+        doc_class_idx = columns.index("doc_class")
+        question_type_idx = columns.index("question_type")
+
+        for offset, record in records:
+            row = next(csv.reader([record.decode(encoding)], delimiter=sep))
+            key = (row[doc_class_idx], row[question_type_idx])
+            offsets.append(offset)
+            strata_codes.append(strata.setdefault(key, len(strata)))
+
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    with open(f"{index_path}.offsets", "wb") as f:
+        offsets.tofile(f)
+    with open(f"{index_path}.strata", "wb") as f:
+        strata_codes.tofile(f)
+
+    stat = os.stat(csv_path)
+    meta = {
+        "format": INDEX_FORMAT_VERSION,
+        "kind": VQA_INDEX_KIND,
+        "csv_path": os.path.abspath(csv_path),
+        "csv_size": stat.st_size,
+        "csv_mtime": stat.st_mtime,
+        "sep": sep,
+        "columns": columns,
+        "num_rows": len(offsets),
+        "strata": [list(key) for key in strata],
+    }
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return index_path
+
+
+def load_vqa_index(index_path: str, csv_path: Optional[str] = None) -> VQAIndex:
+    """Загружает индекс VQA, построенный функцией build_vqa_index.
+
+    Аргументы:
+        index_path (str): Путь к файлу с метаданными индекса.
+        csv_path (Optional[str]): Путь к CSV-файлу, для которого нужен индекс. Если задан,
+            проверяется, что индекс построен именно для него. По умолчанию None.
+
+    Возвращает:
+        VQAIndex: Загруженный индекс.
+
+    Выбрасывает:
+        ValueError: Если файл не является индексом VQA, построен для другого CSV-файла или устарел.
+    """
+    with open(index_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("kind") != VQA_INDEX_KIND or meta.get("format") != INDEX_FORMAT_VERSION:
+        raise ValueError(f"'{index_path}' is not a VQA index of format {INDEX_FORMAT_VERSION}!")
+    if csv_path is not None and os.path.abspath(csv_path) != meta["csv_path"]:
+        raise ValueError(f"Index '{index_path}' was built for '{meta['csv_path']}', not for '{csv_path}'!")
+
+    stat = os.stat(meta["csv_path"])
+    if stat.st_size != meta["csv_size"] or stat.st_mtime != meta["csv_mtime"]:
+        raise ValueError(f"Index '{index_path}' is outdated, rebuild it!")
+
+    offsets = array("Q")
+    strata_codes = array("I")
+    with open(f"{index_path}.offsets", "rb") as f:
+        offsets.fromfile(f, meta["num_rows"])
+    with open(f"{index_path}.strata", "rb") as f:
+        strata_codes.fromfile(f, meta["num_rows"])
+
+    return VQAIndex(
+        csv_path=meta["csv_path"],
+        sep=meta["sep"],
+        columns=meta["columns"],
+        offsets=offsets,
+        strata=[tuple(key) for key in meta["strata"]],
+        strata_codes=strata_codes,
+    )
+
+
+def load_or_build_vqa_index(dataset_dir_path: str, csv_name: str = "annotation.csv") -> VQAIndex:
+    """Загружает индекс VQA из директории датасета или из кэша, а если его нет или он устарел, строит заново.
+
+    Индекс строится в директории датасета, а если она недоступна для записи (например,
+    смонтирована только для чтения), - в директории кэша get_cache_dir().
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        csv_name (str): Имя CSV-файла с аннотацией данных. По умолчанию 'annotation.csv'.
+
+    Возвращает:
+        VQAIndex: Загруженный индекс.
+
+    Выбрасывает:
+        ValueError: Если индекс не удалось сохранить ни в директории датасета, ни в кэше.
+    """
+    csv_path = os.path.join(dataset_dir_path, csv_name)
+    index_dirs = [dataset_dir_path, get_vqa_cache_index_dir(dataset_dir_path, csv_name)]
+    for index_dir_path in index_dirs:
+        try:
+            return load_vqa_index(get_vqa_index_path(dataset_dir_path, csv_name, index_dir_path), csv_path)
+        except (FileNotFoundError, ValueError):
+            pass
+
+    errors = []
+    for index_dir_path in index_dirs:
+        try:
+            return load_vqa_index(build_vqa_index(dataset_dir_path, csv_name, index_dir_path=index_dir_path), csv_path)
+        except OSError as e:
+            if not os.path.exists(csv_path):
+                raise
+            errors.append(f"{index_dir_path}: {e}")
+    raise ValueError(f"Cannot save the index of '{csv_path}' ({'; '.join(errors)}). "
+                     f"Build it with `dataset-iterator index --output-dir <writable dir>` "
+                     f"and set its path in iterator.index_path.")
+
+
+def read_vqa_records(index: VQAIndex, rows: Sequence[int], encoding: str = "utf-8") -> str:
+    """Читает из CSV-файла только указанные строки данных, переходя к ним по смещениям из индекса.
+
+    Записи возвращаются как текст CSV без заголовка, чтобы их можно было разобрать тем же
+    pd.read_csv, что и весь файл, и получить значения тех же типов.
+
+    Аргументы:
+        index (VQAIndex): Индекс CSV-файла.
+        rows (Sequence[int]): Номера строк данных по возрастанию.
+        encoding (str): Кодировка CSV-файла. По умолчанию "utf-8".
+
+    Возвращает:
+        str: Выбранные записи CSV-файла, каждая заканчивается переводом строки.
+    """
+    records = []
+    with open(index.csv_path, "rb") as f:
+        for row in rows:
+            f.seek(index.offsets[row])
+            if row + 1 < index.num_rows:
+                record = f.read(index.offsets[row + 1] - index.offsets[row])
+            else:
+                record = f.read()
+            record = record.decode(encoding)
+            records.append(record if record.endswith("\n") else record + "\n")
+    return "".join(records)
+
+
+def build_rpo_index(dataset_dir_path: str, index_dir_path: Optional[str] = None) -> str:
+    """Строит индекс датасета RPO: список пачек документов с путями к изображениям и json-ответам.
+
+    Пачки упорядочены по id, поэтому выборка по индексу с одним и тем же зерном не зависит
+    от порядка обхода директорий в файловой системе.
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        index_dir_path (Optional[str]): Директория для индекса. По умолчанию совпадает с директорией датасета.
+
+    Возвращает:
+        str: Путь к файлу индекса.
+    """
+    images_dir = os.path.join(dataset_dir_path, 'images')
+    jsons_dir = os.path.join(dataset_dir_path, 'jsons')
+    index_path = get_rpo_index_path(dataset_dir_path, index_dir_path)
+
+    bundles = []
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            json_name = f'{entry.name}.json'
+            if not os.path.exists(os.path.join(jsons_dir, json_name)):
+                continue
+            with os.scandir(entry.path) as images:
+                image_names = [image.name for image in images if image.name.endswith('.jpg')]
+            bundles.append({
+                "id": int(entry.name),
+                "images": [os.path.join('images', entry.name, name) for name in image_names],
+                "json": os.path.join('jsons', json_name),
+            })
+
+    bundles.sort(key=lambda bundle: bundle["id"])
+
+    meta = {
+        "format": INDEX_FORMAT_VERSION,
+        "kind": RPO_INDEX_KIND,
+        "bundles": bundles,
+    }
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return index_path
+
+
+def load_rpo_index(index_path: str) -> List[dict]:
+    """Загружает индекс RPO, построенный функцией build_rpo_index.
+
+    Аргументы:
+        index_path (str): Путь к файлу индекса.
+
+    Возвращает:
+        List[dict]: Список пачек с ключами "id", "images" и "json", упорядоченный по id. Пути заданы относительно директории датасета.
+
+    Выбрасывает:
+        ValueError: Если файл не является индексом RPO.
+    """
+    with open(index_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("kind") != RPO_INDEX_KIND or meta.get("format") != INDEX_FORMAT_VERSION:
+        raise ValueError(f"'{index_path}' is not a RPO index of format {INDEX_FORMAT_VERSION}!")
+    return meta["bundles"]
+
+
+def build_index(task_name: str, dataset_dir_path: str, csv_name: str = "annotation.csv",
+                index_dir_path: Optional[str] = None) -> str:
+    """Строит индекс датасета для указанной задачи.
+
+    Аргументы:
+        task_name (str): Название задачи (например, "VQA").
+        dataset_dir_path (str): Путь к директории с датасетом.
+        csv_name (str): Имя CSV-файла с аннотацией данных (только для VQA). По умолчанию 'annotation.csv'.
+        index_dir_path (Optional[str]): Директория для индекса. По умолчанию совпадает с директорией датасета.
+
+    Возвращает:
+        str: Путь к построенному индексу.
+
+    Выбрасывает:
+        ValueError: Если для задачи индекс не реализован.
+    """
+    kind = TASK_INDEX_KINDS.get(task_name)
+    if kind == VQA_INDEX_KIND:
+        return build_vqa_index(dataset_dir_path, csv_name, index_dir_path=index_dir_path)
+    if kind == RPO_INDEX_KIND:
+        return build_rpo_index(dataset_dir_path, index_dir_path=index_dir_path)
+    raise ValueError(f"Index for task '{task_name}' is not implemented!")
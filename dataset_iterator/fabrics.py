@@ -1,24 +1,37 @@
-from typing import Optional, TypeVar
+import importlib
+from typing import Callable, List, Optional, Type, TypeVar, Union
 
 from .abstract_dataset_runner import TIterator, AbstractDatasetRunner
-from .rpo_iterator import RPODatasetIterator
-from .sorting_runner import SortingRunner
-from .classification_runner import ClassificationRunner
-from .vqa_iterator import VQADatasetIterator
-from .vqa_dataset_runner import VQADatasetRunner
 
 # Определяем TypeVar с ограничением на AbstractDatasetRunner и его наследников
 TRunner = TypeVar('TRunner', bound=AbstractDatasetRunner)
 
+# Класс или строка вида "module:ClassName", по которой класс будет импортирован при первом запросе
+TRegistryEntry = Union[str, Type]
+
 
 class IteratorFabric:
     """Фабрика для получения итератора и объекта для прогона модели по датасету.
 
+    Классы итераторов и раннеров задаются строками вида "module:ClassName" и импортируются
+    только при первом запросе задачи, поэтому импорт фабрики не тянет за собой pandas,
+    tqdm и prompt_adapter.
+
+    Для каждой задачи может быть зарегистрировано несколько реализаций (бэкендов), бэкенд
+    выбирается по имени в get_dataset_iterator и get_runner. Сторонние пакеты регистрируют
+    свои реализации методами register_iterator и register_runner или через группы entry points
+    "dataset_iterator.iterators" и "dataset_iterator.runners". Имя entry point - название задачи
+    для бэкенда по умолчанию или "<задача>.<бэкенд>", например:
+
+        [tool.poetry.plugins."dataset_iterator.iterators"]
+        "VQA.mmap" = "my_package.iterators:MmapVQAIterator"
+
     Атрибуты:
         _VQAName (str): Название задачи VQA.
         _RPOName (str): Название задачи RPO.
-        _iterators (dict): Словарь, сопоставляющий название задачи с классом итератора.
-        _runers (dict): Словарь, сопоставляющий название задачи с классом для прогона.
+        DEFAULT_BACKEND (str): Название бэкенда по умолчанию.
+        _iterators (dict): Словарь, сопоставляющий название задачи и бэкенда с классом итератора или путём к нему.
+        _runers (dict): Словарь, сопоставляющий название задачи и бэкенда с классом для прогона или путём к нему.
         _tasks (set): Множество названий задач, для которых реализованы итераторы и прогоны.
     """
 
@@ -26,26 +39,180 @@ class IteratorFabric:
     _RPOClassificationName = "RPOClassification"
     _RPOSortingName = "RPOSorting"
 
+    DEFAULT_BACKEND = "default"
+
+    ITERATORS_ENTRY_POINT_GROUP = "dataset_iterator.iterators"
+    RUNNERS_ENTRY_POINT_GROUP = "dataset_iterator.runners"
+
     _iterators = {
-        _VQAName: VQADatasetIterator,
-        _RPOClassificationName: RPODatasetIterator,
-        _RPOSortingName: RPODatasetIterator,
+        _VQAName: {DEFAULT_BACKEND: ".vqa_iterator:VQADatasetIterator"},
+        _RPOClassificationName: {DEFAULT_BACKEND: ".rpo_iterator:RPODatasetIterator"},
+        _RPOSortingName: {DEFAULT_BACKEND: ".rpo_iterator:RPODatasetIterator"},
     }
 
     _runers = {
-        _VQAName: VQADatasetRunner,
-        _RPOClassificationName: ClassificationRunner,
-        _RPOSortingName: SortingRunner,
+        _VQAName: {DEFAULT_BACKEND: ".vqa_dataset_runner:VQADatasetRunner"},
+        _RPOClassificationName: {DEFAULT_BACKEND: ".classification_runner:ClassificationRunner"},
+        _RPOSortingName: {DEFAULT_BACKEND: ".sorting_runner:SortingRunner"},
     }
 
     _tasks = _iterators.keys()
 
+    _entry_points_loaded = False
+
+    @staticmethod
+    def _register(registry: dict, task_name: str, backend: str, entry: TRegistryEntry, override: bool) -> None:
+        """Добавляет класс или путь к нему в словарь _iterators или _runers.
+
+        Выбрасывает:
+            ValueError: Если бэкенд уже зарегистрирован для задачи и override не задан.
+        """
+        backends = registry.setdefault(task_name, {})
+        if backend in backends and not override:
+            raise ValueError(f"Backend '{backend}' is already registered for task '{task_name}'!")
+        backends[backend] = entry
+
+    @classmethod
+    def _load_entry_points(cls) -> None:
+        """Регистрирует реализации из entry points установленных пакетов.
+
+        Выполняется один раз при первом обращении к реестру. Классы не импортируются, пока
+        их не запросят. Реализации, зарегистрированные явно, entry points не перекрывают.
+        """
+        if cls._entry_points_loaded:
+            return
+        cls._entry_points_loaded = True
+
+        from importlib.metadata import entry_points
+
+        for group, registry in ((cls.ITERATORS_ENTRY_POINT_GROUP, cls._iterators),
+                                (cls.RUNNERS_ENTRY_POINT_GROUP, cls._runers)):
+            for entry_point in entry_points(group=group):
+                task_name, _, backend = entry_point.name.partition(".")
+                backends = registry.setdefault(task_name, {})
+                backends.setdefault(backend or cls.DEFAULT_BACKEND, entry_point.value)
+
     @classmethod
-    def get_dataset_iterator(cls, task_name: str, dataset_name: str, start: int = 0, 
-                             filter_doc_class: Optional[str] = None, filter_question_type: Optional[str] = None, 
+    def _resolve(cls, registry: dict, task_name: str, backend: Optional[str] = None) -> Type:
+        """Возвращает класс, зарегистрированный для задачи, импортируя его при первом обращении.
+
+        Аргументы:
+            registry (dict): Словарь _iterators или _runers.
+            task_name (str): Название задачи.
+            backend (Optional[str]): Название бэкенда. По умолчанию DEFAULT_BACKEND.
+
+        Возвращает:
+            Type: Класс итератора или раннера.
+
+        Выбрасывает:
+            ValueError: Если задача или бэкенд не реализованы.
+        """
+        cls._load_entry_points()
+        backend = backend or cls.DEFAULT_BACKEND
+        if task_name not in registry:
+            raise ValueError(f"Task '{task_name}' is not implemented!")
+        backends = registry[task_name]
+        if backend not in backends:
+            raise ValueError(f"Backend '{backend}' is not implemented for task '{task_name}'!")
+
+        entry: TRegistryEntry = backends[backend]
+        if isinstance(entry, str):
+            module_name, _, class_name = entry.partition(":")
+            entry = importlib.import_module(module_name, __package__)
+            for name in class_name.split("."):
+                entry = getattr(entry, name)
+            backends[backend] = entry
+        return entry
+
+    @classmethod
+    def register_iterator(cls, task_name: str, iterator: Optional[TRegistryEntry] = None,
+                          backend: Optional[str] = None, override: bool = False) -> Union[Type, Callable[[Type], Type]]:
+        """Регистрирует класс итератора для задачи.
+
+        Может использоваться как декоратор:
+
+            @IteratorFabric.register_iterator("VQA", backend="mmap")
+            class MmapVQAIterator(VQADatasetIterator):
+                ...
+
+        Аргументы:
+            task_name (str): Название задачи. Может быть новой задачей.
+            iterator (Optional[TRegistryEntry]): Класс итератора или путь к нему вида "module:ClassName".
+                Если не задан, возвращается декоратор.
+            backend (Optional[str]): Название бэкенда. По умолчанию DEFAULT_BACKEND.
+            override (bool): Заменить уже зарегистрированный бэкенд. По умолчанию False.
+
+        Возвращает:
+            Зарегистрированный класс или декоратор.
+
+        Выбрасывает:
+            ValueError: Если бэкенд уже зарегистрирован для задачи и override не задан.
+        """
+        def decorator(entry: TRegistryEntry) -> TRegistryEntry:
+            cls._register(cls._iterators, task_name, backend or cls.DEFAULT_BACKEND, entry, override)
+            return entry
+
+        return decorator(iterator) if iterator is not None else decorator
+
+    @classmethod
+    def register_runner(cls, task_name: str, runner: Optional[TRegistryEntry] = None,
+                        backend: Optional[str] = None, override: bool = False) -> Union[Type, Callable[[Type], Type]]:
+        """Регистрирует класс для прогона модели для задачи.
+
+        Может использоваться как декоратор, аналогично register_iterator.
+
+        Аргументы:
+            task_name (str): Название задачи. Может быть новой задачей.
+            runner (Optional[TRegistryEntry]): Класс раннера или путь к нему вида "module:ClassName".
+                Если не задан, возвращается декоратор.
+            backend (Optional[str]): Название бэкенда. По умолчанию DEFAULT_BACKEND.
+            override (bool): Заменить уже зарегистрированный бэкенд. По умолчанию False.
+
+        Возвращает:
+            Зарегистрированный класс или декоратор.
+
+        Выбрасывает:
+            ValueError: Если бэкенд уже зарегистрирован для задачи и override не задан.
+        """
+        def decorator(entry: TRegistryEntry) -> TRegistryEntry:
+            cls._register(cls._runers, task_name, backend or cls.DEFAULT_BACKEND, entry, override)
+            return entry
+
+        return decorator(runner) if runner is not None else decorator
+
+    @classmethod
+    def get_task_names(cls) -> List[str]:
+        """Возвращает названия задач, для которых зарегистрирован итератор или раннер, не импортируя их.
+
+        Задача, зарегистрированная плагином только с одной стороны, тоже попадает в список, чтобы
+        ошибку регистрации было видно; какие бэкенды есть у задачи, показывает get_backends.
+        """
+        cls._load_entry_points()
+        return list(dict.fromkeys([*cls._tasks, *cls._runers]))
+
+    @classmethod
+    def get_backends(cls, task_name: str) -> dict:
+        """Возвращает названия бэкендов итераторов и раннеров, зарегистрированных для задачи.
+
+        Аргументы:
+            task_name (str): Название задачи.
+
+        Возвращает:
+            dict: Словарь с ключами "iterators" и "runners" и списками названий бэкендов.
+        """
+        cls._load_entry_points()
+        return {
+            "iterators": list(cls._iterators.get(task_name, {})),
+            "runners": list(cls._runers.get(task_name, {})),
+        }
+
+    @classmethod
+    def get_dataset_iterator(cls, task_name: str, dataset_name: str, start: int = 0,
+                             filter_doc_class: Optional[str] = None, filter_question_type: Optional[str] = None,
                              dataset_dir_path: str = '/data', csv_name: str = 'annotation.csv',
-                             prompt_file_dir: str = 'prompts', prompt_file_name: str = "prompt.txt", *args, **kwargs) -> TIterator:
-        
+                             prompt_file_dir: str = 'prompts', prompt_file_name: str = "prompt.txt",
+                             *args, backend: Optional[str] = None, **kwargs) -> TIterator:
+
         """Возвращает итератор по датасету для указанной задачи.
 
         Аргументы:
@@ -56,17 +223,16 @@ class IteratorFabric:
             filter_question_type (Optional[str]): Фильтр для типа вопроса. По умолчанию None.
             dataset_dir_path (str): Путь к директории с датасетом. По умолчанию '/data'.
             csv_name (str): Имя CSV-файла с аннотацией данных. По умолчанию 'annotations.csv'.
+            backend (Optional[str]): Название реализации итератора. По умолчанию DEFAULT_BACKEND.
             **kwargs: Дополнительные аргументы для инициализации итератора.
 
         Возвращает:
             TIterator: Итератор по датасету.
 
         Выбрасывает:
-            ValueError: Если задача не реализована.
+            ValueError: Если задача или бэкенд не реализованы.
         """
-        if task_name not in cls._tasks:
-            raise ValueError(f"Task '{task_name}' is not implemented!")
-        return cls._iterators[task_name](
+        return cls._resolve(cls._iterators, task_name, backend)(
             task_name=task_name,
             dataset_name=dataset_name,
             start=start,
@@ -81,17 +247,23 @@ class IteratorFabric:
         )
 
     @classmethod
-    def get_runner(cls, iterator: TIterator, model, answers_dir_path: str = "/workspace/answers", 
-                   csv_name: str = "answers.csv", **kwargs) -> TRunner:
+    def get_runner(cls, iterator: TIterator, model, answers_dir_path: str = "/workspace/answers",
+                   csv_name: str = "answers.csv", backend: Optional[str] = None, **kwargs) -> TRunner:
 
         """Возвращает объект для запуска прогона модели по датасету.
 
         Аргументы:
             iterator (TIterator): Итератор по датасету.
             model (ModelInterface): Модель, которая будет использоваться для обработки данных.
+            backend (Optional[str]): Название реализации раннера. По умолчанию DEFAULT_BACKEND.
             **kwargs: Дополнительные аргументы для инициализации объекта прогона.
 
         Возвращает:
             AbstractDatasetRunner: Объект для прогона модели по датасету.
+
+        Выбрасывает:
+            ValueError: Если задача или бэкенд не реализованы.
         """
-        return cls._runers[iterator.task_name](iterator, model, answers_dir_path, csv_name, **kwargs)
+        return cls._resolve(cls._runers, iterator.task_name, backend)(
+            iterator, model, answers_dir_path, csv_name, **kwargs
+        )
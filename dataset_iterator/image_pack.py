@@ -0,0 +1,258 @@
+import os
+import json
+import mmap
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+# Модуль использует только стандартную библиотеку, упаковка запускается из консоли.
+
+PACK_FORMAT_VERSION = 2
+
+PACK_INDEX_NAME = "images.pack.index.json"
+
+# Размер одного pack-файла по умолчанию - 4 ГиБ
+DEFAULT_MAX_PACK_SIZE = 4 * 1024 ** 3
+
+# Начало каждого изображения выравнивается по странице, чтобы чтение не задевало соседние файлы
+_ALIGNMENT = 4096
+
+# Суффиксы бинарных файлов индекса: ключи изображений подряд в UTF-8, смещения ключей,
+# номер pack-файла, смещение и длина каждого изображения
+_INDEX_ARRAYS = {
+    "key_offsets": "Q",
+    "pack_nos": "I",
+    "offsets": "Q",
+    "lengths": "Q",
+}
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def _normalize_path(path: str) -> str:
+    """Приводит относительный путь к изображению к виду, в котором он хранится в индексе."""
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def get_pack_index_path(dataset_dir_path: str, output_dir_path: Optional[str] = None) -> str:
+    """Возвращает путь к индексу pack-файлов датасета.
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        output_dir_path (Optional[str]): Директория с pack-файлами. По умолчанию совпадает с директорией датасета.
+    """
+    return os.path.join(output_dir_path or dataset_dir_path, PACK_INDEX_NAME)
+
+
+def pack_images(dataset_dir_path: str, output_dir_path: Optional[str] = None,
+                max_pack_size: int = DEFAULT_MAX_PACK_SIZE) -> str:
+    """Упаковывает все изображения из директории images датасета в большие pack-файлы.
+
+    Изображения записываются подряд с выравниванием по 4 КиБ, для каждого в индексе
+    сохраняются номер pack-файла, смещение и длина. Ключ изображения - путь относительно
+    директории датасета, как в аннотации VQA ("images/0.jpg") и в RPO ("images/0/1.jpg").
+
+    Индекс, как и индекс датасета, состоит из метаданных в JSON и бинарных массивов:
+    отсортированных ключей и смещений с длинами изображений. Он загружается за время чтения
+    этих файлов, без разбора JSON-словаря на каждое изображение.
+
+    Аргументы:
+        dataset_dir_path (str): Путь к директории с датасетом.
+        output_dir_path (Optional[str]): Директория для pack-файлов. По умолчанию совпадает с директорией датасета.
+        max_pack_size (int): Максимальный размер одного pack-файла в байтах. По умолчанию 4 ГиБ.
+
+    Возвращает:
+        str: Путь к индексу pack-файлов.
+    """
+    output_dir_path = output_dir_path or dataset_dir_path
+    os.makedirs(output_dir_path, exist_ok=True)
+    images_dir = os.path.join(dataset_dir_path, 'images')
+
+    packs: List[str] = []
+    entries: List[Tuple[bytes, int, int, int]] = []
+    pack_file = None
+    pack_size = 0
+
+    try:
+        for root, dirs, names in os.walk(images_dir):
+            dirs.sort()
+            for name in sorted(names):
+                if not name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                image_path = os.path.join(root, name)
+                with open(image_path, 'rb') as f:
+                    data = f.read()
+
+                padding = -pack_size % _ALIGNMENT
+                if pack_file is None or (pack_size + padding + len(data) > max_pack_size and pack_size > 0):
+                    if pack_file is not None:
+                        pack_file.close()
+                    packs.append(f"images-{len(packs):05d}.pack")
+                    pack_file = open(os.path.join(output_dir_path, packs[-1]), 'wb')
+                    pack_size = padding = 0
+
+                pack_file.write(b"\0" * padding)
+                pack_size += padding
+                key = _normalize_path(os.path.relpath(image_path, dataset_dir_path)).encode("utf-8")
+                entries.append((key, len(packs) - 1, pack_size, len(data)))
+                pack_file.write(data)
+                pack_size += len(data)
+    finally:
+        if pack_file is not None:
+            pack_file.close()
+
+    # Ключи сортируются по байтам UTF-8, чтобы искать изображение двоичным поиском
+    entries.sort()
+    arrays = {name: array(typecode) for name, typecode in _INDEX_ARRAYS.items()}
+    arrays["key_offsets"].append(0)
+    for key, pack_no, offset, length in entries:
+        arrays["key_offsets"].append(arrays["key_offsets"][-1] + len(key))
+        arrays["pack_nos"].append(pack_no)
+        arrays["offsets"].append(offset)
+        arrays["lengths"].append(length)
+
+    index_path = get_pack_index_path(dataset_dir_path, output_dir_path)
+    with open(f"{index_path}.keys", 'wb') as f:
+        f.write(b"".join(entry[0] for entry in entries))
+    for name, values in arrays.items():
+        with open(f"{index_path}.{name}", 'wb') as f:
+            values.tofile(f)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump({"format": PACK_FORMAT_VERSION, "packs": packs, "num_files": len(entries)}, f, ensure_ascii=False)
+    return index_path
+
+
+class ImagePack:
+    """Доступ к изображениям, упакованным функцией pack_images, без копирования.
+
+    Pack-файлы отображаются в память через mmap при первом обращении, изображения
+    возвращаются как memoryview поверх отображения. Пока существуют выданные memoryview,
+    закрыть pack нельзя: close выбросит BufferError.
+
+    Атрибуты:
+        index_path (str): Путь к индексу pack-файлов.
+        num_files (int): Количество изображений в pack-файлах.
+    """
+
+    def __init__(self, index_path: str) -> None:
+        """Читает метаданные индекса pack-файлов. Смещения изображений загружаются при первом обращении.
+
+        Аргументы:
+            index_path (str): Путь к индексу pack-файлов.
+
+        Выбрасывает:
+            ValueError: Если файл не является индексом pack-файлов текущего формата.
+        """
+        with open(index_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("format") != PACK_FORMAT_VERSION or "num_files" not in meta:
+            raise ValueError(f"'{index_path}' is not an image pack index of format {PACK_FORMAT_VERSION}, "
+                             f"rebuild it with `dataset-iterator pack`!")
+
+        self.index_path = index_path
+        self.num_files = meta["num_files"]
+        pack_dir = os.path.dirname(index_path)
+        self._pack_paths = [os.path.join(pack_dir, name) for name in meta["packs"]]
+        self._views: List[Optional[memoryview]] = [None] * len(self._pack_paths)
+        self._mmaps: List[Optional[mmap.mmap]] = [None] * len(self._pack_paths)
+        self._keys: Optional[bytes] = None
+        self._arrays = {}
+
+    def _load_index(self) -> None:
+        """Загружает отсортированные ключи и смещения изображений из бинарных файлов индекса."""
+        if self._keys is not None:
+            return
+        for name, typecode in _INDEX_ARRAYS.items():
+            values = array(typecode)
+            with open(f"{self.index_path}.{name}", 'rb') as f:
+                values.fromfile(f, self.num_files + 1 if name == "key_offsets" else self.num_files)
+            self._arrays[name] = values
+        with open(f"{self.index_path}.keys", 'rb') as f:
+            self._keys = f.read()
+
+    def _key(self, position: int) -> bytes:
+        key_offsets = self._arrays["key_offsets"]
+        return self._keys[key_offsets[position]:key_offsets[position + 1]]
+
+    def _find(self, image_path: str) -> int:
+        """Возвращает номер изображения в индексе или -1, если его нет. Ищет двоичным поиском по ключам."""
+        self._load_index()
+        key = _normalize_path(image_path).encode("utf-8")
+        low, high = 0, self.num_files
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.num_files and self._key(low) == key else -1
+
+    def keys(self) -> Iterator[str]:
+        """Возвращает пути всех изображений относительно директории датасета в отсортированном порядке."""
+        self._load_index()
+        for position in range(self.num_files):
+            yield self._key(position).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.num_files
+
+    def _get_pack_view(self, pack_no: int) -> memoryview:
+        view = self._views[pack_no]
+        if view is None:
+            with open(self._pack_paths[pack_no], 'rb') as f:
+                self._mmaps[pack_no] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = self._views[pack_no] = memoryview(self._mmaps[pack_no])
+        return view
+
+    def get(self, image_path: str) -> memoryview:
+        """Возвращает байты изображения без копирования.
+
+        Аргументы:
+            image_path (str): Путь к изображению относительно директории датасета.
+
+        Возвращает:
+            memoryview: Байты изображения.
+
+        Выбрасывает:
+            KeyError: Если изображения нет в pack-файлах.
+        """
+        position = self._find(image_path)
+        if position < 0:
+            raise KeyError(image_path)
+        offset = self._arrays["offsets"][position]
+        length = self._arrays["lengths"][position]
+        return self._get_pack_view(self._arrays["pack_nos"][position])[offset:offset + length]
+
+    def __contains__(self, image_path: str) -> bool:
+        return self._find(image_path) >= 0
+
+    def close(self) -> None:
+        """Закрывает отображения pack-файлов в память.
+
+        Pack-файлы, байты которых ещё используются, остаются открытыми и доступными для чтения,
+        остальные закрываются.
+
+        Выбрасывает:
+            BufferError: Если остались memoryview, выданные методом get.
+        """
+        busy_packs = []
+        for pack_no, view in enumerate(self._views):
+            if view is None:
+                continue
+            view.release()
+            try:
+                self._mmaps[pack_no].close()
+            except BufferError:
+                # Выданные memoryview держат отображение, pack остаётся рабочим
+                self._views[pack_no] = memoryview(self._mmaps[pack_no])
+                busy_packs.append(self._pack_paths[pack_no])
+                continue
+            self._views[pack_no] = self._mmaps[pack_no] = None
+        if busy_packs:
+            raise BufferError(f"Cannot close {', '.join(busy_packs)}: images from it are still in use, "
+                              f"release their memoryviews first!")
+
+    def __enter__(self) -> 'ImagePack':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
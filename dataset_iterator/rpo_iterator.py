@@ -1,9 +1,10 @@
 import os
 import json
-from typing import Optional, List
+from typing import Optional, List, Union
 
 from .abstract_iterator import AbstractIterator, AbstractSample
-from prompt_adapter.rpo_prompt_adapter import TXTPromptAdapter
+from .dataset_index import load_rpo_index
+from .sampling import select_sample
 
 
 class RPOSample(AbstractSample):
@@ -13,15 +14,16 @@ class RPOSample(AbstractSample):
 
     Атрибуты:
         id (int): Уникальный идентификатор объекта датасета.
-        images (List[str]): Список путей к изображению одного семпла.
+        images (List[Union[str, memoryview]]): Список путей к изображению одного семпла или байты изображений,
+            если итератор читает изображения из pack-файлов.
         answer (dict): Правильный ответ на задачу классификации и сортировки.
         prompt (str): Промпт к модели.
     """
-    images: List[str]
+    images: List[Union[str, memoryview]]
     answer: dict
     prompt: str
 
-    def __init__(self, id: int, images: List[str], answer: dict, prompt: str) -> None:
+    def __init__(self, id: int, images: List[Union[str, memoryview]], answer: dict, prompt: str) -> None:
         """Инициализирует экземпляр VQASample.
 
         Аргументы:
@@ -46,20 +48,31 @@ class RPODatasetIterator(AbstractIterator):
     def __init__(self, task_name: str, dataset_name: str, start: int = 0, 
                  filter_doc_class: Optional[str] = None, filter_question_type: Optional[str] = None, 
                  dataset_dir_path: str = '/data', csv_name: str = 'annotation.csv',
-                 prompt_file_dir: str = 'prompts', prompt_file_name: str = "prompt.txt") -> None:
+                 prompt_file_dir: str = 'prompts', prompt_file_name: str = "prompt.txt",
+                 index_path: Optional[str] = None, image_pack_path: Optional[str] = None,
+                 sample_size: Optional[int] = None, sample_fraction: Optional[float] = None, sample_seed: int = 0,
+                 stratify_by: Optional[List[str]] = None) -> None:
         """Инициализирует экземпляр RPODatasetIterator.
 
         Аргументы:
             prompt_file_path (str): Название файла с коллекцией промптов.
             prompt_file_dir (str): Путь к файлу с коллекцией промптов. По умолчанию '/prompts'
+            index_path (Optional[str]): Путь к индексу датасета. Если задан, директории не обходятся. По умолчанию None.
+            image_pack_path (Optional[str]): Путь к индексу pack-файлов. Если задан, сэмплы содержат байты изображений. По умолчанию None.
+            sample_size (Optional[int]): Количество пачек в случайной выборке. По умолчанию None - все пачки.
+            sample_fraction (Optional[float]): Доля пачек в случайной выборке. По умолчанию None - все пачки.
+            sample_seed (int): Зерно генератора случайных чисел для выборки. По умолчанию 0.
+            stratify_by (Optional[List[str]]): Не поддерживается для RPO, должен быть None.
             *args: Аргументы для базового класса.
             **kwargs: Ключевые аргументы для базового класса.
         """
-        super().__init__(task_name, dataset_name, start, filter_doc_class, filter_question_type, dataset_dir_path, csv_name)
+        super().__init__(task_name, dataset_name, start, filter_doc_class, filter_question_type, dataset_dir_path, csv_name,
+                         index_path, image_pack_path, sample_size, sample_fraction, sample_seed, stratify_by)
         self.samples = []
         self.index = 0
         
         # Промпт адаптер обязателен
+        from prompt_adapter.rpo_prompt_adapter import TXTPromptAdapter
         self.prompt_adapter = TXTPromptAdapter(prompt_file_name, prompt_file_dir)
 
         self._read_data()
@@ -68,6 +81,16 @@ class RPODatasetIterator(AbstractIterator):
     def _read_data(self) -> None:
         """Собирает все пути до файлов и создает список объектов RPOSample.
         """
+        if self.is_sampled:
+            self._read_sampled_data()
+            return
+        if self.index_path:
+            self._read_data_by_index()
+            return
+        if self.image_pack:
+            self._load_bundles(self._get_pack_bundles())
+            return
+
         images_dir = os.path.join(self.dataset_dir_path, 'images')
         jsons_dir = os.path.join(self.dataset_dir_path, 'jsons')
 
@@ -93,7 +116,88 @@ class RPODatasetIterator(AbstractIterator):
                                        answer=json_data,
                                        prompt=sample_prompt)
                     self.samples.append(sample)
-        
+
+    def _read_data_by_index(self) -> None:
+        """Создает список объектов RPOSample по индексу датасета, не обходя директории с изображениями.
+        """
+        self._load_bundles(load_rpo_index(self.index_path))
+
+    def _get_pack_bundles(self) -> List[dict]:
+        """Собирает список пачек документов по ключам индекса pack-файлов, не обходя директории с изображениями.
+
+        Пачка - поддиректория images с изображениями .jpg, для которой есть json-ответ, как при обходе директорий.
+
+        Возвращает:
+            List[dict]: Пачки в формате индекса RPO, упорядоченные по id.
+        """
+        json_names = set(os.listdir(os.path.join(self.dataset_dir_path, 'jsons')))
+        bundle_images = {}
+        for key in self.image_pack.keys():
+            parts = key.split('/')
+            if len(parts) == 3 and parts[0] == 'images' and parts[2].endswith('.jpg'):
+                bundle_images.setdefault(parts[1], []).append(key)
+        bundles = [
+            {"id": int(dir_name), "images": images, "json": os.path.join('jsons', f'{dir_name}.json')}
+            for dir_name, images in bundle_images.items() if f'{dir_name}.json' in json_names
+        ]
+        bundles.sort(key=lambda bundle: bundle["id"])
+        return bundles
+
+    def _read_sampled_data(self) -> None:
+        """Создает список объектов RPOSample для воспроизводимой случайной выборки пачек документов.
+
+        Json-ответы и списки изображений читаются только для попавших в выборку пачек.
+
+        Выбрасывает:
+            ValueError: Если задана стратификация: у пачек документов RPO нет полей для неё.
+        """
+        if self.stratify_by:
+            raise ValueError("Stratified sampling is not supported for RPO!")
+
+        if self.index_path:
+            bundles = load_rpo_index(self.index_path)
+        elif self.image_pack:
+            bundles = self._get_pack_bundles()
+        else:
+            images_dir = os.path.join(self.dataset_dir_path, 'images')
+            json_names = set(os.listdir(os.path.join(self.dataset_dir_path, 'jsons')))
+            with os.scandir(images_dir) as entries:
+                bundles = [
+                    {"id": int(entry.name), "images": None,
+                     "dir": os.path.join('images', entry.name), "json": os.path.join('jsons', f'{entry.name}.json')}
+                    for entry in entries if entry.is_dir() and f'{entry.name}.json' in json_names
+                ]
+        # Порядок обхода директорий зависит от файловой системы, а выборка должна зависеть только от зерна.
+        # Индексы, построенные до упорядочивания пачек по id, тоже хранят их в порядке обхода
+        bundles.sort(key=lambda bundle: bundle["id"])
+
+        # Страт у пачек нет, поэтому коды строк не важны, и выборка простая случайная
+        positions = select_sample(range(len(bundles)), self.sample_size, self.sample_fraction, self.sample_seed)
+        self._load_bundles([bundles[i] for i in positions])
+
+    def _load_bundles(self, bundles: List[dict]) -> None:
+        """Создает объекты RPOSample по описаниям пачек в формате индекса RPO.
+
+        Аргументы:
+            bundles (List[dict]): Пачки с ключами "id", "images" и "json". Если "images" равно None,
+                изображения берутся из директории "dir". Пути заданы относительно директории датасета.
+        """
+        prompt = self.prompt_adapter.get_prompt()
+        for bundle in bundles:
+            if bundle["images"] is None:
+                dir_path = os.path.join(self.dataset_dir_path, bundle["dir"])
+                images = [os.path.join(dir_path, img) for img in os.listdir(dir_path) if img.endswith('.jpg')]
+            else:
+                images = [os.path.join(self.dataset_dir_path, image) for image in bundle["images"]]
+            with open(os.path.join(self.dataset_dir_path, bundle["json"]), 'r', encoding='utf-8') as f:
+                json_data = json.load(f)
+
+            sample_prompt = f"Количество поданных страниц документов - {len(images)}.\n" + prompt
+            self.samples.append(RPOSample(id=bundle["id"],
+                                          images=images,
+                                          answer=json_data,
+                                          prompt=sample_prompt))
+
     def __next__(self) -> RPOSample:
         """Возвращает следующий сэмпл из датасета.
 
@@ -106,6 +210,10 @@ class RPODatasetIterator(AbstractIterator):
         if self.index < len(self.samples):
             sample = self.samples[self.index]
             self.index += 1
+            if self.image_pack:
+                # Заменяем пути на байты из pack-файлов, не трогая сохранённый сэмпл
+                images = [self.image_pack.get(os.path.relpath(image, self.dataset_dir_path)) for image in sample.images]
+                return RPOSample(id=sample.id, images=images, answer=sample.answer, prompt=sample.prompt)
             return sample
         else:
             raise StopIteration
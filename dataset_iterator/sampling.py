@@ -0,0 +1,112 @@
+import random
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Sequence
+
+# Выборка считается по кодам страт из индекса датасета, без загрузки таблицы с аннотацией.
+
+
+def resolve_sample_size(population: int, sample_size: Optional[int] = None,
+                        sample_fraction: Optional[float] = None) -> Optional[int]:
+    """Переводит размер или долю выборки в количество сэмплов.
+
+    Аргументы:
+        population (int): Количество сэмплов, из которых делается выборка.
+        sample_size (Optional[int]): Размер выборки. По умолчанию None.
+        sample_fraction (Optional[float]): Доля выборки из (0, 1]. По умолчанию None.
+
+    Возвращает:
+        Optional[int]: Количество сэмплов в выборке, не больше population, или None, если выборка не задана.
+
+    Выбрасывает:
+        ValueError: Если заданы и размер, и доля, или они вне допустимых значений.
+    """
+    if sample_size is not None and sample_fraction is not None:
+        raise ValueError("Only one of sample_size and sample_fraction can be set!")
+    if sample_size is not None:
+        if sample_size < 0:
+            raise ValueError(f"sample_size must be non-negative, got {sample_size}!")
+        return min(sample_size, population)
+    if sample_fraction is not None:
+        if not 0 < sample_fraction <= 1:
+            raise ValueError(f"sample_fraction must be in (0, 1], got {sample_fraction}!")
+        return min(max(round(population * sample_fraction), 1), population)
+    return None
+
+
+def _allocate(group_counts: Dict[Hashable, int], sample_size: int) -> Dict[Hashable, int]:
+    """Распределяет размер выборки по группам пропорционально их размеру методом наибольшего остатка."""
+    population = sum(group_counts.values())
+    quotas = {}
+    remainders = []
+    for group, count in group_counts.items():
+        exact = sample_size * count / population
+        quotas[group] = int(exact)
+        remainders.append((exact - int(exact), group))
+    # Группы упорядочены, поэтому при равных остатках распределение воспроизводимо
+    for _, group in sorted(remainders, key=lambda item: -item[0])[:sample_size - sum(quotas.values())]:
+        quotas[group] += 1
+    return quotas
+
+
+def select_sample(codes: Sequence[int], sample_size: Optional[int] = None, sample_fraction: Optional[float] = None,
+                  seed: int = 0, code_groups: Optional[Dict[int, Hashable]] = None,
+                  allowed_codes: Optional[set] = None) -> List[int]:
+    """Выбирает воспроизводимую случайную выборку номеров строк.
+
+    Размер выборки задаётся числом сэмплов или долей от строк, разрешённых allowed_codes.
+    Если не задано ни то, ни другое, возвращаются все разрешённые строки.
+
+    Аргументы:
+        codes (Sequence[int]): Код страты каждой строки, например VQAIndex.strata_codes.
+        sample_size (Optional[int]): Размер выборки. По умолчанию None.
+        sample_fraction (Optional[float]): Доля выборки из (0, 1]. По умолчанию None.
+        seed (int): Зерно генератора случайных чисел. По умолчанию 0.
+        code_groups (Optional[Dict[int, Hashable]]): Группа для каждого кода страты. Если задано,
+            выборка стратифицирована по группам пропорционально их размеру. По умолчанию None - простая
+            случайная выборка.
+        allowed_codes (Optional[set]): Коды страт, из которых делается выборка. По умолчанию все.
+
+    Возвращает:
+        List[int]: Номера выбранных строк по возрастанию.
+
+    Выбрасывает:
+        ValueError: Если заданы и размер, и доля выборки, или они вне допустимых значений.
+    """
+    rng = random.Random(seed)
+    if code_groups is None and allowed_codes is None:
+        size = resolve_sample_size(len(codes), sample_size, sample_fraction)
+        if size is None:
+            return list(range(len(codes)))
+        return sorted(rng.sample(range(len(codes)), size))
+
+    code_counts = Counter(codes)
+    group_of = {}
+    group_counts: Dict[Hashable, int] = {}
+    for code, count in code_counts.items():
+        if allowed_codes is not None and code not in allowed_codes:
+            continue
+        group = code_groups[code] if code_groups is not None else None
+        group_of[code] = group
+        group_counts[group] = group_counts.get(group, 0) + count
+    if not group_counts:
+        return []
+    group_counts = dict(sorted(group_counts.items(), key=lambda item: repr(item[0])))
+
+    population = sum(group_counts.values())
+    size = resolve_sample_size(population, sample_size, sample_fraction)
+    if size is None:
+        return [row for row, code in enumerate(codes) if code in group_of]
+
+    # Выбираем порядковые номера строк внутри каждой группы, затем одним проходом переводим их в номера строк
+    quotas = _allocate(group_counts, size)
+    chosen = {group: set(rng.sample(range(count), quotas[group])) for group, count in group_counts.items()}
+    seen = dict.fromkeys(group_counts, 0)
+    rows = []
+    for row, code in enumerate(codes):
+        if code not in group_of:
+            continue
+        group = group_of[code]
+        if seen[group] in chosen[group]:
+            rows.append(row)
+        seen[group] += 1
+    return rows
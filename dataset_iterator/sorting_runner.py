@@ -1,14 +1,12 @@
 import os
-import csv
-import pandas as pd
 
-from tqdm import tqdm
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Any, Dict
 from collections import Counter
 
-from .abstract_dataset_runner import AbstractDatasetRunner, TIterator
+from .abstract_dataset_runner import MODEL_FAILED, AbstractDatasetRunner, TIterator
+from .answer_sink import read_answers
 from .rpo_iterator import RPOSample
 
 
@@ -17,11 +15,11 @@ class SortingModelAnswer:
     """Класс, представляющий один ответ модели для задачи сортировки на датасете RPO.
 
     Атрибуты:
-        id (int): Уникальный идентификатор ответа, соответствующий идентификатору сэмпла.
-        answer (str): Текст ответа модели.
+        sample_id (int): Уникальный идентификатор ответа, соответствующий идентификатору сэмпла.
+        model_answer (str): Текст ответа модели.
     """
     sample_id: int
-    answer: str
+    model_answer: str
 
 
 class SortingRunner(AbstractDatasetRunner):
@@ -37,7 +35,8 @@ class SortingRunner(AbstractDatasetRunner):
     """
 
     def __init__(self, iterator: TIterator, model: Any, answers_dir_path: str = "/workspace/answers", 
-                 csv_name: str = None, classification_answers_path: str = "/workspace/answers/cls_ans.csv",) -> None:
+                 csv_name: str = None, classification_answers_path: str = "/workspace/answers/cls_ans.csv",
+                 **kwargs) -> None:
         """Инициализирует экземпляр SortingRunner.
 
         Аргументы:
@@ -49,36 +48,33 @@ class SortingRunner(AbstractDatasetRunner):
             filter_question_type (Optional[str]): Фильтр для типа вопроса. По умолчанию None.
             dataset_dir_path (str): Путь к директории с датасетом. По умолчанию '/data'.
             csv_name (str): Имя CSV-файла с аннотацией данных. По умолчанию 'annotation.csv'.
+            **kwargs: Параметры вызова модели для базового класса (timeout, max_retries, retry_delay).
         """
-        super().__init__(iterator, model, answers_dir_path, csv_name)
+        super().__init__(iterator, model, answers_dir_path, csv_name, **kwargs)
         self.classification_answers = self._read_classification_answers(classification_answers_path)
         self.model_answers = []
 
     def _read_classification_answers(self, classification_answers_path: str) -> Dict[int, str]:
-        """Читает CSV-файл с ответами модели и возвращает словарь соответствия индекса сэмпла и ответу модели.
+        """Читает файл с ответами модели классификации и возвращает словарь соответствия индекса сэмпла и ответу модели.
 
         Аргументы:
-            classification_answers_path (str): Путь к CSV-файлу с ответами модели.
+            classification_answers_path (str): Путь к файлу с ответами модели в формате CSV, JSONL или Parquet.
 
         Возвращает:
             Dict[int, str]: Список ответов модели.
         """
-        classification_answers = {}
-
-        with open(classification_answers_path, mode='r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=';',)
-            for row in reader:
-                sample_id = int(row['sample_id'])
-                answer = row['model_answer']
-                classification_answers[sample_id] = answer
-
-        return classification_answers
+        return dict(read_answers(classification_answers_path))
 
     def run(self) -> None:
         """Осуществляет прогон модели по датасету RPO и проводит сортировку внутри документа.
 
         Проходит по всем сэмплам в итераторе, получает ответы модели и сохраняет их.
+        Модель вызывается отдельно для каждого класса документов в пачке. Если хотя бы на одном
+        классе модель не дала ответ, сэмпл попадает в журнал self.model_errors, а ответы на
+        остальные классы этой пачки не сохраняются: команда `dataset-iterator retry` прогоняет
+        пачку целиком, и ответы не дублируются.
         """
+        from tqdm import tqdm
 
         row: RPOSample
         for row in tqdm(self.iterator):
@@ -90,15 +86,23 @@ class SortingRunner(AbstractDatasetRunner):
                 doc_classes = Counter(answer_cls) 
                 doc_classes = {k: v for k, v in doc_classes.items() if v > 1}
 
+                page_orders = []
                 for key in doc_classes.keys():
                     # достаем все картинки нужного класса: сначала получили все индексы, а затем все пути до файлов
                     class_images_idx = [i for i, val in enumerate(answer_cls) if val == key]
                     class_images = [row.images[i] for i in class_images_idx]
 
-                    page_order = self.model.predict_on_images(class_images, row.prompt)
+                    page_order = self.predict(row, self.model.predict_on_images, class_images, row.prompt)
+                    if page_order is MODEL_FAILED:
+                        # сэмпл уже в журнале ошибок, частичные ответы по пачке не сохраняем
+                        break
                     # ответ в формате  "2,2,5,5,3", убираем запятые
-                    page_order = page_order.replace(",", "")
-                    self.add_answer(row, page_order)
+                    if page_order is not None:
+                        page_order = page_order.replace(",", "")
+                    page_orders.append(page_order)
+                else:
+                    for page_order in page_orders:
+                        self.add_answer(row, page_order)
 
     def add_answer(self, sample: RPOSample, answer: str) -> None:
         """Добавляет ответ модели в список ответов.
@@ -122,25 +126,6 @@ class SortingRunner(AbstractDatasetRunner):
         timestamp = datetime.now().strftime(r"%Y%m%d_%H%M%S")  # Формат: ГГГГММДД_ЧЧММСС
         save_path = os.path.join(
             self.answers_dir_path,
-            f"{self.iterator.dataset_name}_MODELFRAMEWORK_{self.model.model_name}_{self.iterator.task_name}_sorting_answers_{timestamp}.csv"
+            f"{self.iterator.dataset_name}_MODELFRAMEWORK_{self.model.model_name}_{self.iterator.task_name}_sorting_answers_{timestamp}.{self.answers_extension}"
         )
         return save_path
-
-    def save_answers(self) -> str:
-        """Сохраняет ответы в CSV-файл по пути self.answers_dir_path с добавлением timestamp в название файла.
-
-        Если список ответов пуст, выводит предупреждение и не сохраняет файл.
-        """
-        if not self.model_answers:
-            print("Нет ответов для сохранения.")
-            return
-
-        # Преобразуем список ответов в DataFrame
-        answers_df = pd.DataFrame([asdict(answer) for answer in self.model_answers])
-
-        # Создаем путь для сохранения файла с timestamp
-        save_path = self.get_answer_filename()
-
-        # Сохраняем DataFrame в CSV
-        answers_df.to_csv(save_path, index=False, sep=" ;")
-        return save_path
@@ -1,8 +1,6 @@
-from dataclasses import dataclass, asdict
-import pandas as pd
-from tqdm import tqdm
+from dataclasses import dataclass
 
-from .abstract_dataset_runner import AbstractDatasetRunner
+from .abstract_dataset_runner import MODEL_FAILED, AbstractDatasetRunner
 from .vqa_iterator import VQASample
 
 
@@ -11,10 +9,10 @@ class VQAModelAnswer:
     """Класс, представляющий один ответ модели для задачи VQA.
 
     Атрибуты:
-        id (int): Уникальный идентификатор ответа, соответствующий идентификатору сэмпла.
+        sample_id (int): Уникальный идентификатор ответа, соответствующий идентификатору сэмпла.
         model_answer (str): Текст ответа модели.
     """
-    id: int
+    sample_id: int
     model_answer: str
 
 
@@ -33,10 +31,15 @@ class VQADatasetRunner(AbstractDatasetRunner):
         """Осуществляет прогон модели по датасету VQA и собирает ответы.
 
         Проходит по всем сэмплам в итераторе, получает ответы модели и сохраняет их.
+        Сэмплы, на которых модель не дала ответ, попадают в журнал self.model_errors.
         """
+        from tqdm import tqdm
+
         row: VQASample
         for row in tqdm(self.iterator):
-            answer = self.model.predict_on_image(row.image_path, row.question)
+            answer = self.predict(row, self.model.predict_on_image, row.image_path, row.question)
+            if answer is MODEL_FAILED:
+                continue
             self.add_answer(row, answer)
 
     def add_answer(self, sample: VQASample, answer: str) -> None:
@@ -52,22 +55,3 @@ class VQADatasetRunner(AbstractDatasetRunner):
                 answer
             )
         )
-
-    def save_answers(self) -> str:
-        """Сохраняет ответы в CSV-файл по пути self.answers_dir_path с добавлением timestamp в название файла.
-
-        Если список ответов пуст, выводит предупреждение и не сохраняет файл.
-        """
-        if not self.model_answers:
-            print("Нет ответов для сохранения.")
-            return
-
-        # Преобразуем список ответов в DataFrame
-        answers_df = pd.DataFrame([asdict(answer) for answer in self.model_answers])
-
-        # Создаем путь для сохранения файла с timestamp
-        save_path = self.get_answer_filename()
-
-        # Сохраняем DataFrame в CSV
-        answers_df.to_csv(save_path, index=False, sep=";", encoding='utf-8-sig')
-        return save_path
@@ -1,9 +1,14 @@
+import io
 import os
-import pandas as pd
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Union
 
 from .abstract_iterator import AbstractIterator, AbstractSample
-from prompt_adapter.prompt_adapter import PromptAdapter
+from .dataset_index import load_or_build_vqa_index, load_vqa_index, read_vqa_records
+from .sampling import select_sample
+
+# pandas и prompt_adapter импортируются при первом использовании, чтобы не замедлять импорт пакета
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class VQASample(AbstractSample):
@@ -11,24 +16,24 @@ class VQASample(AbstractSample):
 
     Атрибуты:
         id (int): Уникальный идентификатор объекта датасета.
-        image_path (str): Путь к изображению.
+        image_path (Union[str, memoryview]): Путь к изображению или его байты, если итератор читает изображения из pack-файлов.
         question (str): Вопрос, связанный с изображением.
         answer (str): Ответ на вопрос.
         doc_class (str): Класс документа.
         question_type (str): Тип вопроса.
     """
-    image_path: str
+    image_path: Union[str, memoryview]
     question: str
     answer: str
     doc_class: str
     question_type: str
 
-    def __init__(self, id: int, image_path: str, question: str, answer: str, doc_class: str, question_type: str) -> None:
+    def __init__(self, id: int, image_path: Union[str, memoryview], question: str, answer: str, doc_class: str, question_type: str) -> None:
         """Инициализирует экземпляр VQASample.
 
         Аргументы:
             id (int): Уникальный идентификатор сэмпла.
-            image_path (str): Путь к изображению.
+            image_path (Union[str, memoryview]): Путь к изображению или его байты.
             question (str): Вопрос, связанный с изображением.
             answer (str): Ответ на вопрос.
             doc_class (str): Класс документа.
@@ -63,6 +68,7 @@ class VQADatasetIterator(AbstractIterator):
         super().__init__(*args, **kwargs)
 
         if prompt_collection_filename:
+            from prompt_adapter.prompt_adapter import PromptAdapter
             self.prompt_adapter = PromptAdapter(prompt_collection_filename, prompt_dir)
         else:
             self.prompt_adapter = None
@@ -74,7 +80,17 @@ class VQADatasetIterator(AbstractIterator):
 
         Считывает CSV-файл с аннотацией, применяет фильтры (если заданы) и инициализирует итератор по данным.
         """
+        import pandas as pd
+
         annot_path = os.path.join(self.dataset_dir_path, self.csv_name)
+        if self.is_sampled:
+            self.iterator = self._read_sampled_data().iterrows()
+            return
+        if self.index_path:
+            dataframe = self._read_data_by_index(annot_path)
+            self.iterator = dataframe.iterrows()
+            return
+
         # Считываем названия столбцов
         dataframe_header = pd.read_csv(annot_path, sep=";", nrows=1)
 
@@ -94,6 +110,90 @@ class VQADatasetIterator(AbstractIterator):
         dataframe.columns = dataframe_header.columns
         self.iterator = dataframe.iterrows()
 
+    def _read_data_by_index(self, annot_path: str) -> 'pd.DataFrame':
+        """Загружает таблицу с аннотацией, начиная с self.row_index, используя индекс датасета.
+
+        Вместо пропуска строк файла переходит сразу к смещению нужной строки, поэтому
+        продолжение прогона с середины большого датасета не требует чтения его начала.
+
+        Аргументы:
+            annot_path (str): Путь к CSV-файлу с аннотацией.
+
+        Возвращает:
+            pd.DataFrame: Таблица с аннотацией с применёнными фильтрами.
+
+        Выбрасывает:
+            ValueError: Если индекс построен для другого CSV-файла или устарел.
+        """
+        import pandas as pd
+
+        index = load_vqa_index(self.index_path, annot_path)
+
+        # Сохраняем смысл start из обычного чтения: start > 0 соответствует строке данных start - 1
+        first_row = max(self.row_index - 1, 0)
+        if first_row >= index.num_rows:
+            return pd.DataFrame(columns=index.columns)
+
+        with open(annot_path, "rb") as f:
+            f.seek(index.offsets[first_row])
+            dataframe = pd.read_csv(f, sep=index.sep, header=None, names=index.columns)
+
+        if self.filter_doc_class:
+            dataframe = dataframe[
+                (dataframe["doc_class"] == self.filter_doc_class) &
+                (dataframe["question_type"] == self.filter_question_type)
+            ]
+        return dataframe
+
+    def _read_sampled_data(self) -> 'pd.DataFrame':
+        """Загружает из таблицы с аннотацией только строки воспроизводимой случайной выборки.
+
+        Выборка считается по индексу датасета: простая случайная или стратифицированная по полям
+        self.stratify_by, с учётом фильтров и self.row_index. Таблица целиком не загружается,
+        выбранные строки читаются по смещениям. Если self.index_path не задан, индекс берётся
+        из директории датасета или кэша и при необходимости строится заново.
+
+        Возвращает:
+            pd.DataFrame: Выбранные строки таблицы с аннотацией.
+
+        Выбрасывает:
+            ValueError: Если в stratify_by есть поля, отличные от doc_class и question_type, заданный индекс
+                устарел или построен для другого CSV-файла, или индекс негде сохранить.
+        """
+        import pandas as pd
+
+        strata_fields = ("doc_class", "question_type")
+        unknown_fields = set(self.stratify_by or []) - set(strata_fields)
+        if unknown_fields:
+            raise ValueError(f"Stratification by {sorted(unknown_fields)} is not supported for VQA!")
+
+        if self.index_path:
+            index = load_vqa_index(self.index_path, os.path.join(self.dataset_dir_path, self.csv_name))
+        else:
+            index = load_or_build_vqa_index(self.dataset_dir_path, self.csv_name)
+
+        code_groups = None
+        if self.stratify_by:
+            field_idx = [strata_fields.index(field) for field in self.stratify_by]
+            code_groups = {code: tuple(key[i] for i in field_idx) for code, key in enumerate(index.strata)}
+
+        allowed_codes = None
+        if self.filter_doc_class:
+            allowed_codes = {code for code, (doc_class, question_type) in enumerate(index.strata)
+                             if doc_class == self.filter_doc_class and question_type == self.filter_question_type}
+
+        # Сохраняем смысл start из обычного чтения: start > 0 соответствует строке данных start - 1
+        first_row = max(self.row_index - 1, 0)
+        rows = select_sample(index.strata_codes[first_row:], self.sample_size, self.sample_fraction,
+                             self.sample_seed, code_groups, allowed_codes)
+        if not rows:
+            return pd.DataFrame(columns=index.columns)
+        # Разбираем записи так же, как при полном чтении, чтобы типы значений совпадали
+        records = read_vqa_records(index, [first_row + row for row in rows])
+        dataframe = pd.read_csv(io.StringIO(records), sep=index.sep, header=None, names=index.columns)
+        dataframe.index = rows
+        return dataframe
+
     def __next__(self) -> VQASample:
         """Возвращает следующий сэмпл из датасета.
 
@@ -113,7 +213,10 @@ class VQADatasetIterator(AbstractIterator):
         if self.prompt_adapter:
             question = self.prompt_adapter.get_prompt(doc_class, question_type)
 
-        image_path = os.path.join(self.dataset_dir_path, image_path)
+        if self.image_pack:
+            image_path = self.image_pack.get(image_path)
+        else:
+            image_path = os.path.join(self.dataset_dir_path, image_path)
 
         return VQASample(
             id=index,
@@ -0,0 +1,82 @@
+import os
+import csv
+import sys
+import json
+import types
+from typing import Iterable, List, Sequence
+from unittest import mock
+
+VQA_COLUMNS = ["image_path", "question", "answer", "doc_class", "question_type"]
+
+
+class ListIterator:
+    """Итератор по списку сэмплов с атрибутами dataset_name и task_name, которые раннеры берут у итератора."""
+
+    def __init__(self, samples: Iterable, task_name: str = "VQA", dataset_name: str = "test") -> None:
+        self.task_name = task_name
+        self.dataset_name = dataset_name
+        self.samples = iter(samples)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.samples)
+
+
+def make_vqa_rows(num_rows: int) -> List[list]:
+    """Возвращает строки аннотации VQA с тремя классами документов и двумя типами вопросов."""
+    return [[f"images/{i}.jpg", f"question {i}", str(i % 7), f"doc_{i % 3}", f"type_{i % 2}"]
+            for i in range(num_rows)]
+
+
+def write_vqa_dataset(dataset_dir_path: str, rows: Sequence[Sequence[str]], csv_name: str = "annotation.csv") -> str:
+    """Записывает CSV-файл с аннотацией VQA в формате датасета и возвращает путь к нему."""
+    os.makedirs(dataset_dir_path, exist_ok=True)
+    csv_path = os.path.join(dataset_dir_path, csv_name)
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(VQA_COLUMNS)
+        writer.writerows(rows)
+    return csv_path
+
+
+def sample_values(samples) -> List[tuple]:
+    """Переводит сэмплы VQA в кортежи для сравнения. NaN заменяется на None, так как NaN != NaN."""
+    def value(x):
+        return None if x != x else x
+
+    return [(s.id, s.image_path, s.question, value(s.answer), s.doc_class, s.question_type) for s in samples]
+
+
+class StubTXTPromptAdapter:
+    """Замена prompt_adapter.rpo_prompt_adapter.TXTPromptAdapter, который не входит в зависимости тестов."""
+
+    def __init__(self, prompt_file_name: str, prompt_file_dir: str) -> None:
+        self.prompt_file_name = prompt_file_name
+
+    def get_prompt(self) -> str:
+        return "prompt"
+
+
+def stub_prompt_adapter(test_case) -> None:
+    """Подменяет модуль prompt_adapter.rpo_prompt_adapter на время теста."""
+    module = types.ModuleType("prompt_adapter.rpo_prompt_adapter")
+    module.TXTPromptAdapter = StubTXTPromptAdapter
+    patcher = mock.patch.dict(sys.modules, {"prompt_adapter": types.ModuleType("prompt_adapter"),
+                                            "prompt_adapter.rpo_prompt_adapter": module})
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+
+
+def write_rpo_dataset(dataset_dir_path: str, bundle_ids: Sequence[int], images_per_bundle: int = 3) -> None:
+    """Записывает датасет RPO: по директории с изображениями и json-ответу на пачку документов."""
+    os.makedirs(os.path.join(dataset_dir_path, "jsons"), exist_ok=True)
+    for bundle_id in bundle_ids:
+        bundle_dir = os.path.join(dataset_dir_path, "images", str(bundle_id))
+        os.makedirs(bundle_dir, exist_ok=True)
+        for image_no in range(images_per_bundle):
+            with open(os.path.join(bundle_dir, f"{image_no}.jpg"), "wb") as f:
+                f.write(f"{bundle_id}/{image_no}".encode())
+        with open(os.path.join(dataset_dir_path, "jsons", f"{bundle_id}.json"), "w", encoding="utf-8") as f:
+            json.dump({"id": bundle_id}, f)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+from dataset_iterator.answer_sink import ANSWER_SINKS, get_answer_sink, read_answers
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+RECORDS = [
+    (0, "plain"),
+    (1, "with ; separator"),
+    (2, 'with "quotes" and \'apostrophes\''),
+    (3, "multi\nline\r\nanswer"),
+    (4, ""),
+    (5, "юникод"),
+    (6, "\ufeffleading BOM"),
+]
+
+
+class AnswerSinkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.tmp_dir.name, name)
+
+    def _formats(self):
+        return [answers_format for answers_format in ANSWER_SINKS if answers_format != "parquet" or HAS_PYARROW]
+
+    def test_round_trip(self):
+        for answers_format in self._formats():
+            with self.subTest(answers_format=answers_format):
+                path = self._path(f"answers.{ANSWER_SINKS[answers_format].extension}")
+                get_answer_sink(answers_format, path).write(iter(RECORDS))
+                self.assertEqual(list(read_answers(path)), RECORDS)
+
+    def test_none_and_non_string_answers_are_consistent(self):
+        records = [(0, None), (1, 42), (2, 1.5)]
+        for answers_format in self._formats():
+            with self.subTest(answers_format=answers_format):
+                path = self._path(f"answers.{ANSWER_SINKS[answers_format].extension}")
+                get_answer_sink(answers_format, path).write(records)
+                self.assertEqual(list(read_answers(path)), [(0, ""), (1, "42"), (2, "1.5")])
+
+    def test_empty_answers(self):
+        for answers_format in self._formats():
+            with self.subTest(answers_format=answers_format):
+                path = self._path(f"answers.{ANSWER_SINKS[answers_format].extension}")
+                get_answer_sink(answers_format, path).write([])
+                self.assertEqual(list(read_answers(path)), [])
+
+    def test_csv_has_bom_and_unified_header(self):
+        path = self._path("answers.csv")
+        get_answer_sink("csv", path).write(RECORDS[:1])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), "\ufeffsample_id;model_answer\r\n0;plain\r\n".encode("utf-8"))
+
+    def test_legacy_csv_headers(self):
+        # VQA сохранял столбец id, сортировка - answer, с пробелом перед разделителем и BOM
+        legacy_files = {
+            "vqa.csv": "\ufeffid;model_answer\n0;yes\n1;\"a;b\"\n",
+            "sorting.csv": "\ufeffsample_id ;answer\n0 ;123\n",
+            "no_bom.csv": "model_answer;id\nno;7\n",
+        }
+        expected = {"vqa.csv": [(0, "yes"), (1, "a;b")], "sorting.csv": [(0, "123")], "no_bom.csv": [(7, "no")]}
+        for name, content in legacy_files.items():
+            with self.subTest(name=name):
+                with open(self._path(name), "w", encoding="utf-8", newline="") as f:
+                    f.write(content)
+                self.assertEqual(list(read_answers(self._path(name))), expected[name])
+
+    def test_format_from_argument(self):
+        path = self._path("answers.txt")
+        get_answer_sink("jsonl", path).write(RECORDS)
+        self.assertEqual(list(read_answers(path, "jsonl")), RECORDS)
+        with self.assertRaises(ValueError):
+            list(read_answers(path))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            get_answer_sink("xml", self._path("answers.xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+from unittest import mock
+
+from dataset_iterator.cli import _FilteredIterator, _run, score_vqa
+
+from .datasets import ListIterator
+
+
+@dataclass
+class _Sample:
+    id: int
+    answer: str = ""
+
+
+def _iterator(ids) -> ListIterator:
+    return ListIterator(_Sample(i) for i in ids)
+
+
+def _ids(iterator) -> list:
+    return [sample.id for sample in iterator]
+
+
+class FilteredIteratorTest(unittest.TestCase):
+
+    def test_shards_cover_dataset_once(self):
+        shards = [_ids(_FilteredIterator(_iterator(range(10)), num_shards=3, shard_index=i)) for i in range(3)]
+        self.assertEqual(shards, [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]])
+
+    def test_shards_follow_position_not_id(self):
+        shard = _ids(_FilteredIterator(_iterator([10, 20, 30, 40]), num_shards=2, shard_index=1))
+        self.assertEqual(shard, [20, 40])
+
+    def test_skip_ids(self):
+        self.assertEqual(_ids(_FilteredIterator(_iterator(range(5)), skip_ids={1, 3})), [0, 2, 4])
+
+    def test_only_ids(self):
+        self.assertEqual(_ids(_FilteredIterator(_iterator(range(5)), only_ids={1, 3, 7})), [1, 3])
+
+    def test_skip_within_shard(self):
+        iterator = _FilteredIterator(_iterator(range(10)), skip_ids={2}, num_shards=2, shard_index=0)
+        self.assertEqual(_ids(iterator), [0, 4, 6, 8])
+
+    def test_attributes_of_wrapped_iterator(self):
+        iterator = _FilteredIterator(_iterator(range(1)))
+        self.assertEqual((iterator.dataset_name, iterator.task_name), ("test", "VQA"))
+
+
+class ScoreVQATest(unittest.TestCase):
+
+    def test_accuracy_over_answered_samples(self):
+        samples = [_Sample(0, "Yes"), _Sample(1, "12  May"), _Sample(2, "no"), _Sample(3, "x")]
+        answers = [(0, " yes"), (1, "12 may"), (2, "yes")]
+        self.assertEqual(score_vqa(samples, answers),
+                         {"total": 4, "answered": 3, "correct": 2, "accuracy": 2 / 3})
+
+    def test_no_answers(self):
+        self.assertEqual(score_vqa([_Sample(0, "a")], []),
+                         {"total": 1, "answered": 0, "correct": 0, "accuracy": 0.0})
+
+
+class _ClosingIterator(ListIterator):
+    """Итератор, который запоминает вызов close и может выбросить BufferError, как ImagePack с живыми memoryview."""
+
+    def __init__(self, ids, close_error=None) -> None:
+        super().__init__(_Sample(i) for i in ids)
+        self.close_error = close_error
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+        if self.close_error:
+            raise self.close_error
+
+
+class RunTest(unittest.TestCase):
+
+    def _run(self, iterator, run_error=None) -> str:
+        """Выполняет _run с подменённой фабрикой и возвращает вывод в stderr."""
+        runner = mock.Mock()
+        runner.run.side_effect = run_error
+        runner.save_answers.return_value = None
+        runner.save_errors.return_value = None
+        with mock.patch("dataset_iterator.fabrics.IteratorFabric.get_dataset_iterator", return_value=iterator), \
+                mock.patch("dataset_iterator.fabrics.IteratorFabric.get_runner", return_value=runner), \
+                mock.patch("dataset_iterator.cli.build_model"), \
+                redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()) as stderr:
+            _run({"iterator": {}})
+        return stderr.getvalue()
+
+    def test_iterator_closed_after_run(self):
+        iterator = _ClosingIterator(range(3))
+        self.assertEqual(self._run(iterator), "")
+        self.assertTrue(iterator.closed)
+
+    def test_iterator_closed_when_run_fails(self):
+        iterator = _ClosingIterator(range(3))
+        with self.assertRaises(RuntimeError):
+            self._run(iterator, RuntimeError("model failed"))
+        self.assertTrue(iterator.closed)
+
+    def test_busy_image_pack_is_a_warning(self):
+        iterator = _ClosingIterator(range(3), close_error=BufferError("images are still in use"))
+        self.assertIn("warning: images are still in use", self._run(iterator))
+
+    def test_iterator_without_close(self):
+        self.assertEqual(self._run(_iterator(range(3))), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
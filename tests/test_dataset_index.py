@@ -0,0 +1,110 @@
+import io
+import os
+import csv
+import tempfile
+import unittest
+
+from dataset_iterator.dataset_index import (_iter_csv_records, build_rpo_index, build_vqa_index, load_rpo_index,
+                                            load_vqa_index, read_vqa_records)
+from dataset_iterator.vqa_iterator import VQADatasetIterator
+
+from .datasets import make_vqa_rows, sample_values, write_vqa_dataset
+
+
+class CSVRecordsTest(unittest.TestCase):
+
+    def test_offsets_of_plain_records(self):
+        data = b"a;b\n1;2\n3;4\n"
+        self.assertEqual(list(_iter_csv_records(io.BytesIO(data))), [(0, b"a;b\n"), (4, b"1;2\n"), (8, b"3;4\n")])
+
+    def test_quoted_newlines_and_escaped_quotes(self):
+        records = [b"a;b\n", b'1;"line 1\nline 2"\n', b'2;"say ""hi""\n;"\n', b'3;"""\n"""\n', b"4;x\n"]
+        data = b"".join(records)
+        offsets = [sum(len(record) for record in records[:i]) for i in range(len(records))]
+        self.assertEqual(list(_iter_csv_records(io.BytesIO(data))), list(zip(offsets, records)))
+
+    def test_crlf_and_blank_lines(self):
+        self.assertEqual(list(_iter_csv_records(io.BytesIO(b"a;b\r\n\r\n1;2\r\n"))),
+                         [(0, b"a;b\r\n"), (7, b"1;2\r\n")])
+
+    def test_last_record_without_newline(self):
+        self.assertEqual(list(_iter_csv_records(io.BytesIO(b"a\n1"))), [(0, b"a\n"), (2, b"1")])
+
+    def test_index_of_multiline_records(self):
+        with tempfile.TemporaryDirectory() as dataset_dir:
+            rows = make_vqa_rows(5)
+            rows[1][1] = 'two\nlines'
+            rows[3][1] = 'with ""quotes"" and ; separator\n'
+            write_vqa_dataset(dataset_dir, rows)
+            index = load_vqa_index(build_vqa_index(dataset_dir))
+
+            self.assertEqual(index.num_rows, 5)
+            self.assertEqual(index.strata[index.strata_codes[4]], ("doc_1", "type_0"))
+            parsed = list(csv.reader(io.StringIO(read_vqa_records(index, [1, 3])), delimiter=";"))
+            self.assertEqual(parsed, [rows[1], rows[3]])
+
+
+class VQAIndexReadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.dataset_dir = os.path.join(self.tmp_dir.name, "vqa")
+        self.rows = make_vqa_rows(20)
+        # Пустой ответ и перевод строки внутри кавычек
+        self.rows[4][2] = ""
+        self.rows[7][1] = 'multi\nline "question"'
+        write_vqa_dataset(self.dataset_dir, self.rows)
+        self.index_path = build_vqa_index(self.dataset_dir)
+
+    def _iterator(self, **kwargs) -> VQADatasetIterator:
+        return VQADatasetIterator(task_name="VQA", dataset_name="test", dataset_dir_path=self.dataset_dir, **kwargs)
+
+    def test_index_read_matches_full_read(self):
+        for start in (0, 1, 5, len(self.rows)):
+            with self.subTest(start=start):
+                self.assertEqual(sample_values(self._iterator(start=start, index_path=self.index_path)),
+                                 sample_values(self._iterator(start=start)))
+
+    def test_index_read_with_filters(self):
+        filters = {"filter_doc_class": "doc_1", "filter_question_type": "type_0"}
+        samples = sample_values(self._iterator(index_path=self.index_path, **filters))
+        self.assertEqual(samples, sample_values(self._iterator(**filters)))
+        self.assertTrue(samples)
+
+    def test_start_past_end(self):
+        self.assertEqual(list(self._iterator(start=len(self.rows) + 5, index_path=self.index_path)), [])
+
+    def test_index_of_other_csv_is_rejected(self):
+        other_dir = os.path.join(self.tmp_dir.name, "other")
+        write_vqa_dataset(other_dir, make_vqa_rows(20))
+        other_index_path = build_vqa_index(other_dir)
+        with self.assertRaises(ValueError):
+            self._iterator(index_path=other_index_path)
+
+    def test_outdated_index_is_rejected(self):
+        write_vqa_dataset(self.dataset_dir, make_vqa_rows(21))
+        with self.assertRaises(ValueError):
+            self._iterator(index_path=self.index_path)
+
+
+class RPOIndexTest(unittest.TestCase):
+
+    def test_bundles_sorted_by_id(self):
+        with tempfile.TemporaryDirectory() as dataset_dir:
+            for bundle_id in (10, 2, 33, 4, 1):
+                os.makedirs(os.path.join(dataset_dir, "images", str(bundle_id)))
+                open(os.path.join(dataset_dir, "images", str(bundle_id), "0.jpg"), "wb").close()
+                os.makedirs(os.path.join(dataset_dir, "jsons"), exist_ok=True)
+                with open(os.path.join(dataset_dir, "jsons", f"{bundle_id}.json"), "w") as f:
+                    f.write("{}")
+            # Пачка без json-ответа не попадает в индекс
+            os.makedirs(os.path.join(dataset_dir, "images", "7"))
+
+            bundles = load_rpo_index(build_rpo_index(dataset_dir))
+            self.assertEqual([bundle["id"] for bundle in bundles], [1, 2, 4, 10, 33])
+            self.assertEqual(bundles[0]["images"], [os.path.join("images", "1", "0.jpg")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from importlib.metadata import EntryPoint
+from unittest import mock
+
+from dataset_iterator.cli import cmd_tasks
+from dataset_iterator.fabrics import IteratorFabric
+
+
+class DummyIterator:
+    def __init__(self, task_name, **kwargs) -> None:
+        self.task_name = task_name
+        self.kwargs = kwargs
+
+
+class OtherIterator(DummyIterator):
+    pass
+
+
+class DummyRunner:
+    def __init__(self, iterator, model, answers_dir_path, csv_name, **kwargs) -> None:
+        self.iterator = iterator
+        self.model = model
+        self.kwargs = kwargs
+
+
+def _entry_points(iterators=(), runners=()):
+    """Возвращает подмену importlib.metadata.entry_points с заданными entry points."""
+    groups = {
+        IteratorFabric.ITERATORS_ENTRY_POINT_GROUP: [
+            EntryPoint(name, value, IteratorFabric.ITERATORS_ENTRY_POINT_GROUP) for name, value in iterators],
+        IteratorFabric.RUNNERS_ENTRY_POINT_GROUP: [
+            EntryPoint(name, value, IteratorFabric.RUNNERS_ENTRY_POINT_GROUP) for name, value in runners],
+    }
+    return lambda group: groups[group]
+
+
+class IteratorFabricTest(unittest.TestCase):
+
+    def setUp(self):
+        # Реестры - атрибуты класса, восстанавливаем их содержимое после каждого теста
+        saved = {id(registry): {task: dict(backends) for task, backends in registry.items()}
+                 for registry in (IteratorFabric._iterators, IteratorFabric._runers)}
+
+        def restore():
+            for registry in (IteratorFabric._iterators, IteratorFabric._runers):
+                registry.clear()
+                registry.update(saved[id(registry)])
+            IteratorFabric._entry_points_loaded = False
+
+        self.addCleanup(restore)
+        self._load_entry_points()
+
+    def _load_entry_points(self, **kwargs):
+        IteratorFabric._entry_points_loaded = False
+        with mock.patch("importlib.metadata.entry_points", side_effect=_entry_points(**kwargs)):
+            IteratorFabric._load_entry_points()
+
+    def test_register_by_call(self):
+        IteratorFabric.register_iterator("Foo", DummyIterator)
+        IteratorFabric.register_runner("Foo", DummyRunner)
+
+        iterator = IteratorFabric.get_dataset_iterator(task_name="Foo", dataset_name="test", extra=1)
+        self.assertIsInstance(iterator, DummyIterator)
+        self.assertEqual(iterator.kwargs["extra"], 1)
+        runner = IteratorFabric.get_runner(iterator=iterator, model="model", max_retries=2)
+        self.assertIsInstance(runner, DummyRunner)
+        self.assertEqual(runner.kwargs, {"max_retries": 2})
+
+    def test_register_by_decorator(self):
+        @IteratorFabric.register_iterator("VQA", backend="fast")
+        class FastIterator(DummyIterator):
+            pass
+
+        self.assertIsInstance(FastIterator, type)
+        iterator = IteratorFabric.get_dataset_iterator(task_name="VQA", dataset_name="test", backend="fast")
+        self.assertIsInstance(iterator, FastIterator)
+        self.assertEqual(IteratorFabric.get_backends("VQA")["iterators"], ["default", "fast"])
+
+    def test_register_lazy_path(self):
+        IteratorFabric.register_iterator("Foo", "tests.test_fabrics:DummyIterator")
+        self.assertEqual(IteratorFabric._iterators["Foo"]["default"], "tests.test_fabrics:DummyIterator")
+        self.assertIs(IteratorFabric._resolve(IteratorFabric._iterators, "Foo"), DummyIterator)
+        # После первого обращения в реестре хранится импортированный класс
+        self.assertIs(IteratorFabric._iterators["Foo"]["default"], DummyIterator)
+
+    def test_duplicate_without_override(self):
+        IteratorFabric.register_iterator("Foo", DummyIterator)
+        with self.assertRaisesRegex(ValueError, "already registered"):
+            IteratorFabric.register_iterator("Foo", OtherIterator)
+        with self.assertRaisesRegex(ValueError, "already registered"):
+            IteratorFabric.register_runner("VQA", DummyRunner)
+
+        IteratorFabric.register_iterator("Foo", OtherIterator, override=True)
+        self.assertIs(IteratorFabric._resolve(IteratorFabric._iterators, "Foo"), OtherIterator)
+
+    def test_unknown_task_and_backend(self):
+        with self.assertRaisesRegex(ValueError, "Task 'Foo' is not implemented"):
+            IteratorFabric.get_dataset_iterator(task_name="Foo", dataset_name="test")
+        with self.assertRaisesRegex(ValueError, "Backend 'missing' is not implemented for task 'VQA'"):
+            IteratorFabric.get_dataset_iterator(task_name="VQA", dataset_name="test", backend="missing")
+        with self.assertRaisesRegex(ValueError, "Backend 'missing' is not implemented for task 'VQA'"):
+            IteratorFabric.get_runner(iterator=DummyIterator("VQA"), model=None, backend="missing")
+
+    def test_entry_points(self):
+        IteratorFabric.register_iterator("Bar", OtherIterator)
+        self._load_entry_points(
+            iterators=[("Foo", "tests.test_fabrics:DummyIterator"), ("VQA.fast", "tests.test_fabrics:OtherIterator"),
+                       ("Bar", "tests.test_fabrics:DummyIterator")],
+            runners=[("Foo.fast", "tests.test_fabrics:DummyRunner")],
+        )
+
+        self.assertEqual(IteratorFabric.get_backends("Foo"), {"iterators": ["default"], "runners": ["fast"]})
+        self.assertIsInstance(IteratorFabric.get_dataset_iterator(task_name="VQA", dataset_name="t", backend="fast"),
+                              OtherIterator)
+        runner = IteratorFabric.get_runner(iterator=DummyIterator("Foo"), model=None, backend="fast")
+        self.assertIsInstance(runner, DummyRunner)
+        # Entry point не перекрывает явно зарегистрированную реализацию
+        self.assertIsInstance(IteratorFabric.get_dataset_iterator(task_name="Bar", dataset_name="t"), OtherIterator)
+
+    def test_entry_points_are_loaded_once(self):
+        IteratorFabric._entry_points_loaded = False
+        with mock.patch("importlib.metadata.entry_points", side_effect=_entry_points()) as entry_points:
+            IteratorFabric.get_task_names()
+            IteratorFabric.get_backends("VQA")
+        self.assertEqual(entry_points.call_count, 2)
+
+    def test_task_names_include_half_registered_tasks(self):
+        self._load_entry_points(iterators=[("Foo", "tests.test_fabrics:DummyIterator")],
+                                runners=[("Baz", "tests.test_fabrics:DummyRunner")])
+        self.assertEqual(IteratorFabric.get_task_names(),
+                         ["VQA", "RPOClassification", "RPOSorting", "Foo", "Baz"])
+
+        with redirect_stdout(io.StringIO()) as output:
+            cmd_tasks(None)
+        lines = output.getvalue().splitlines()
+        self.assertIn("VQA: iterators=default runners=default", lines)
+        self.assertIn("Foo: iterators=default runners=(not registered)", lines)
+        self.assertIn("Baz: iterators=(not registered) runners=default", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+
+from dataset_iterator.image_pack import ImagePack, pack_images
+from dataset_iterator.vqa_iterator import VQADatasetIterator
+
+from .datasets import make_vqa_rows, write_vqa_dataset
+
+
+def _write_image(dataset_dir: str, relative_path: str, size: int) -> bytes:
+    data = os.urandom(size)
+    path = os.path.join(dataset_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return data
+
+
+class ImagePackTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.dataset_dir = os.path.join(self.tmp_dir.name, "dataset")
+        self.images = {
+            "images/0.jpg": _write_image(self.dataset_dir, "images/0.jpg", 5000),
+            "images/1.png": _write_image(self.dataset_dir, "images/1.png", 100),
+            "images/7/0.jpeg": _write_image(self.dataset_dir, "images/7/0.jpeg", 9000),
+            "images/7/1.jpg": _write_image(self.dataset_dir, "images/7/1.jpg", 1),
+        }
+        _write_image(self.dataset_dir, "images/notes.txt", 10)
+
+    def _pack(self, dataset_dir=None, **kwargs) -> ImagePack:
+        pack = ImagePack(pack_images(dataset_dir or self.dataset_dir, **kwargs))
+        self.addCleanup(pack.close)
+        return pack
+
+    def test_round_trip(self):
+        pack = self._pack()
+        self.assertEqual(list(pack.keys()), sorted(self.images))
+        for image_path, data in self.images.items():
+            self.assertEqual(bytes(pack.get(image_path)), data)
+        self.assertNotIn("images/notes.txt", pack)
+
+    def test_pack_rollover(self):
+        pack = self._pack(output_dir_path=os.path.join(self.tmp_dir.name, "packs"), max_pack_size=10_000)
+        pack_sizes = [os.path.getsize(path) for path in pack._pack_paths]
+        self.assertGreater(len(pack_sizes), 1)
+        self.assertTrue(all(size <= 10_000 for size in pack_sizes))
+        for image_path, data in self.images.items():
+            self.assertEqual(bytes(pack.get(image_path)), data)
+        self.assertTrue(all(offset % 4096 == 0 for offset in pack._arrays["offsets"]))
+
+    def test_missing_image(self):
+        pack = self._pack()
+        for image_path in ("images/2.jpg", "images/0.jp", "images/7", "", "images/notes.txt"):
+            with self.subTest(image_path=image_path):
+                self.assertNotIn(image_path, pack)
+                with self.assertRaises(KeyError):
+                    pack.get(image_path)
+
+    def test_index_is_loaded_lazily(self):
+        pack = self._pack()
+        self.assertEqual(len(pack), len(self.images))
+        self.assertIsNone(pack._keys)
+        pack.get("images/1.png")
+        self.assertIsNotNone(pack._keys)
+
+    def test_old_json_index_is_rejected(self):
+        index_path = os.path.join(self.tmp_dir.name, "old.index.json")
+        with open(index_path, "w") as f:
+            f.write('{"format": 1, "packs": [], "files": {}}')
+        with self.assertRaisesRegex(ValueError, "dataset-iterator pack"):
+            ImagePack(index_path)
+
+    def test_oversized_image_gets_own_pack(self):
+        pack = self._pack(max_pack_size=1000)
+        self.assertEqual(len(pack._pack_paths), len(self.images))
+        self.assertEqual(bytes(pack.get("images/7/0.jpeg")), self.images["images/7/0.jpeg"])
+
+    def test_relative_dataset_path(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        self.addCleanup(os.chdir, cwd)
+        for dataset_dir in ("dataset", "./dataset", "./dataset/"):
+            with self.subTest(dataset_dir=dataset_dir):
+                pack = self._pack(dataset_dir)
+                self.assertEqual(list(pack.keys()), sorted(self.images))
+                self.assertEqual(bytes(pack.get("./images/7/../0.jpg")), self.images["images/0.jpg"])
+                self.assertEqual(bytes(pack.get(os.path.join("images", "7", "1.jpg"))), self.images["images/7/1.jpg"])
+
+    def test_close_with_live_memoryview(self):
+        pack = self._pack()
+        image = pack.get("images/0.jpg")
+        with self.assertRaises(BufferError):
+            pack.close()
+        # Pack остаётся рабочим, выданные байты не испорчены
+        self.assertEqual(bytes(image), self.images["images/0.jpg"])
+        self.assertEqual(bytes(pack.get("images/1.png")), self.images["images/1.png"])
+
+        image.release()
+        pack.close()
+        self.assertEqual(pack._mmaps, [None])
+        # После закрытия pack-файл открывается заново при следующем обращении
+        self.assertEqual(bytes(pack.get("images/1.png")), self.images["images/1.png"])
+
+    def test_iterator_closes_pack(self):
+        rows = make_vqa_rows(3)
+        for row, image_path in zip(rows, ["images/0.jpg", "images/1.png", "images/7/0.jpeg"]):
+            row[0] = image_path
+        write_vqa_dataset(self.dataset_dir, rows)
+        with VQADatasetIterator(task_name="VQA", dataset_name="test", dataset_dir_path=self.dataset_dir,
+                                image_pack_path=pack_images(self.dataset_dir)) as iterator:
+            images = [bytes(sample.image_path) for sample in iterator]
+            image_pack = iterator.image_pack
+        self.assertEqual(images, [self.images["images/0.jpg"], self.images["images/1.png"],
+                                  self.images["images/7/0.jpeg"]])
+        self.assertTrue(all(mm is None for mm in image_pack._mmaps))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import re
+import sys
+import subprocess
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Зависимости, которые не должны импортироваться при старте пакета, как в benchmarks/import_time.py
+HEAVY_MODULES = {"pandas", "numpy", "tqdm", "prompt_adapter"}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+\s+\|\s+\d+\s+\|\s*(\S+)$")
+
+
+def _imported_modules(module: str) -> set:
+    """Импортирует модуль в новом процессе с -X importtime и возвращает названия импортированных модулей."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True, cwd=REPO_ROOT, env=env)
+    return {match.group(1) for match in map(_IMPORTTIME_LINE.match, result.stderr.splitlines()) if match}
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_no_heavy_imports(self):
+        for module in ("dataset_iterator.fabrics", "dataset_iterator.cli", "dataset_iterator.dataset_index"):
+            with self.subTest(module=module):
+                imported = _imported_modules(module)
+                self.assertIn(module, imported)
+                heavy = sorted({name for name in imported if name.split(".")[0] in HEAVY_MODULES})
+                self.assertEqual(heavy, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
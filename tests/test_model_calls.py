@@ -0,0 +1,116 @@
+import time
+import threading
+import unittest
+
+from dataset_iterator.vqa_dataset_runner import VQADatasetRunner
+from dataset_iterator.vqa_iterator import VQASample
+
+from .datasets import ListIterator
+
+
+def _iterator(num_samples: int) -> ListIterator:
+    return ListIterator(VQASample(i, f"images/{i}.jpg", "question", "answer", "doc", "type")
+                        for i in range(num_samples))
+
+
+class _SlowModel:
+    """Модель, которая отвечает за delay секунд на первых slow_calls вызовах и считает одновременные вызовы."""
+
+    model_name = "slow"
+    framework = "test"
+
+    def __init__(self, delay: float, slow_calls: int = 1_000) -> None:
+        self.delay = delay
+        self.slow_calls = slow_calls
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def predict_on_image(self, image, question) -> str:
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            delay = self.delay if self.calls <= self.slow_calls else 0
+        time.sleep(delay)
+        with self._lock:
+            self.running -= 1
+        return "answer"
+
+
+class _FlakyModel:
+    """Модель, которая выбрасывает исключение на первых failures вызовах."""
+
+    model_name = "flaky"
+    framework = "test"
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def predict_on_image(self, image, question) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("model failed")
+        return "answer"
+
+
+class ModelCallTest(unittest.TestCase):
+
+    def test_timed_out_call_is_not_run_in_parallel(self):
+        model = _SlowModel(delay=0.5)
+        runner = VQADatasetRunner(_iterator(3), model, timeout=0.1, max_retries=2, retry_delay=0)
+        runner.run()
+
+        self.assertEqual(model.max_running, 1)
+        self.assertEqual(runner.model_answers, [])
+        self.assertEqual([error.sample_id for error in runner.model_errors], [0, 1, 2])
+        self.assertTrue(all(error.error_type == "ModelTimeoutError" for error in runner.model_errors))
+        # После превышения времени вызов не повторяется
+        self.assertEqual(runner.model_errors[0].attempts, 1)
+
+    def test_next_call_waits_for_timed_out_call(self):
+        model = _SlowModel(delay=0.15, slow_calls=1)
+        runner = VQADatasetRunner(_iterator(2), model, timeout=0.1)
+        runner.run()
+
+        self.assertEqual(model.max_running, 1)
+        self.assertEqual([error.sample_id for error in runner.model_errors], [0])
+        self.assertEqual([answer.sample_id for answer in runner.model_answers], [1])
+
+    def test_retries_after_error(self):
+        model = _FlakyModel(failures=2)
+        runner = VQADatasetRunner(_iterator(1), model, max_retries=2, retry_delay=0)
+        runner.run()
+
+        self.assertEqual(model.calls, 3)
+        self.assertEqual(runner.model_errors, [])
+        self.assertEqual([answer.model_answer for answer in runner.model_answers], ["answer"])
+
+    def test_error_ledger_after_all_retries(self):
+        model = _FlakyModel(failures=10)
+        runner = VQADatasetRunner(_iterator(1), model, max_retries=1, retry_delay=0)
+        runner.run()
+
+        self.assertEqual(len(runner.model_errors), 1)
+        error = runner.model_errors[0]
+        self.assertEqual((error.sample_id, error.attempts, error.error_type), (0, 2, "RuntimeError"))
+
+    def test_none_answer_is_kept(self):
+        model = _FlakyModel(failures=0)
+        model.predict_on_image = lambda image, question: None
+        runner = VQADatasetRunner(_iterator(3), model, timeout=1)
+        runner.run()
+
+        self.assertEqual([(a.sample_id, a.model_answer) for a in runner.model_answers],
+                         [(0, None), (1, None), (2, None)])
+        self.assertEqual(runner.model_errors, [])
+
+    def test_negative_max_retries(self):
+        with self.assertRaises(ValueError):
+            VQADatasetRunner(_iterator(1), _FlakyModel(0), max_retries=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from dataset_iterator.dataset_index import build_rpo_index
+from dataset_iterator.image_pack import pack_images
+from dataset_iterator.rpo_iterator import RPODatasetIterator
+
+from .datasets import stub_prompt_adapter, write_rpo_dataset
+
+
+def _bundles(iterator) -> list:
+    """Переводит сэмплы RPO в кортежи (id, изображения, ответ) для сравнения."""
+    return [(sample.id, sorted(bytes(image) if isinstance(image, memoryview) else image for image in sample.images),
+             sample.answer) for sample in iterator]
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class RPOIteratorTest(unittest.TestCase):
+
+    def setUp(self):
+        stub_prompt_adapter(self)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.dataset_dir = os.path.join(self.tmp_dir.name, "rpo")
+        write_rpo_dataset(self.dataset_dir, [5, 1, 12, 3])
+        # Пачка без json-ответа пропускается
+        write_rpo_dataset(self.dataset_dir, [8])
+        os.remove(os.path.join(self.dataset_dir, "jsons", "8.json"))
+
+    def _iterator(self, **kwargs) -> RPODatasetIterator:
+        iterator = RPODatasetIterator(task_name="RPOClassification", dataset_name="test",
+                                      dataset_dir_path=self.dataset_dir, **kwargs)
+        self.addCleanup(iterator.close)
+        return iterator
+
+    def test_pack_mode_without_index_does_not_scan_images(self):
+        image_pack_path = pack_images(self.dataset_dir)
+        with mock.patch("os.listdir", wraps=os.listdir) as listdir, mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            iterator = self._iterator(image_pack_path=image_pack_path)
+        # Читается только список json-ответов
+        self.assertEqual([call.args[0] for call in listdir.call_args_list], [os.path.join(self.dataset_dir, "jsons")])
+        scandir.assert_not_called()
+
+        self.assertEqual(_bundles(iterator),
+                         [(bundle_id, [f"{bundle_id}/{n}".encode() for n in range(3)], {"id": bundle_id})
+                          for bundle_id in (1, 3, 5, 12)])
+
+    def test_index_matches_directory_scan(self):
+        index_path = build_rpo_index(self.dataset_dir, index_dir_path=self.tmp_dir.name)
+
+        self.assertEqual(sorted(_bundles(self._iterator(index_path=index_path))),
+                         sorted(_bundles(self._iterator())))
+        self.assertEqual(_bundles(self._iterator(index_path=index_path, sample_size=2, sample_seed=1)),
+                         _bundles(self._iterator(sample_size=2, sample_seed=1)))
+
+    def test_same_seed_gives_same_sample(self):
+        def sample_ids(**kwargs) -> list:
+            return [sample.id for sample in self._iterator(sample_size=2, **kwargs)]
+
+        ids = sample_ids(sample_seed=7)
+        self.assertEqual(len(ids), 2)
+        self.assertTrue(set(ids) <= {1, 3, 5, 12})
+        self.assertEqual(sample_ids(sample_seed=7), ids)
+        # Выборка зависит от зерна
+        self.assertGreater(len({tuple(sample_ids(sample_seed=seed)) for seed in range(10)}), 1)
+
+    def test_pack_sample_matches_directory_scan(self):
+        image_pack_path = pack_images(self.dataset_dir)
+        packed = [(bundle_id, images, answer) for bundle_id, images, answer
+                  in _bundles(self._iterator(image_pack_path=image_pack_path, sample_fraction=0.5, sample_seed=3))]
+        scanned = [(bundle_id, [_read_file(image) for image in images], answer) for bundle_id, images, answer
+                   in _bundles(self._iterator(sample_fraction=0.5, sample_seed=3))]
+
+        self.assertEqual(len(packed), 2)
+        self.assertEqual(packed, scanned)
+
+    def test_stratify_by_raises(self):
+        with self.assertRaises(ValueError):
+            self._iterator(sample_size=2, stratify_by=["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
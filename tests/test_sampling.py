@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from collections import Counter
+
+from dataset_iterator import dataset_index
+from dataset_iterator.sampling import _allocate, resolve_sample_size, select_sample
+from dataset_iterator.vqa_iterator import VQADatasetIterator
+
+from .datasets import make_vqa_rows, sample_values, write_vqa_dataset
+
+
+class SelectSampleTest(unittest.TestCase):
+
+    def setUp(self):
+        # Три страты размером 50, 30 и 20
+        self.codes = [0] * 50 + [1] * 30 + [2] * 20
+
+    def test_same_seed_same_rows(self):
+        first = select_sample(self.codes, sample_size=10, seed=42)
+        self.assertEqual(first, select_sample(self.codes, sample_size=10, seed=42))
+        self.assertNotEqual(first, select_sample(self.codes, sample_size=10, seed=43))
+        self.assertEqual(first, sorted(set(first)))
+
+    def test_same_seed_same_stratified_rows(self):
+        code_groups = {0: "a", 1: "b", 2: "c"}
+        self.assertEqual(select_sample(self.codes, sample_fraction=0.1, seed=7, code_groups=code_groups),
+                         select_sample(self.codes, sample_fraction=0.1, seed=7, code_groups=code_groups))
+
+    def test_stratified_quotas_are_proportional(self):
+        rows = select_sample(self.codes, sample_size=10, code_groups={0: "a", 1: "b", 2: "c"})
+        self.assertEqual(Counter(self.codes[row] for row in rows), {0: 5, 1: 3, 2: 2})
+
+    def test_largest_remainder_allocation(self):
+        # Точные доли 3.5, 2.1 и 1.4: целые части 3 + 2 + 1, оставшийся сэмпл получает наибольший остаток
+        self.assertEqual(_allocate({"a": 50, "b": 30, "c": 20}, 7), {"a": 4, "b": 2, "c": 1})
+        self.assertEqual(_allocate({"a": 1, "b": 1, "c": 1}, 3), {"a": 1, "b": 1, "c": 1})
+
+    def test_groups_merge_codes(self):
+        rows = select_sample(self.codes, sample_size=10, code_groups={0: "a", 1: "b", 2: "b"})
+        counts = Counter(self.codes[row] for row in rows)
+        self.assertEqual((counts[0], counts[1] + counts[2]), (5, 5))
+
+    def test_allowed_codes(self):
+        rows = select_sample(self.codes, sample_size=100, allowed_codes={2})
+        self.assertEqual(rows, list(range(80, 100)))
+        self.assertEqual(select_sample(self.codes, sample_size=5, allowed_codes={3}), [])
+
+    def test_no_sample_returns_all_rows(self):
+        self.assertEqual(select_sample(self.codes), list(range(100)))
+        self.assertEqual(select_sample(self.codes, allowed_codes={1}), list(range(50, 80)))
+
+    def test_resolve_sample_size(self):
+        self.assertEqual(resolve_sample_size(100, sample_size=150), 100)
+        self.assertEqual(resolve_sample_size(100, sample_fraction=0.001), 1)
+        self.assertIsNone(resolve_sample_size(100))
+        with self.assertRaises(ValueError):
+            resolve_sample_size(100, sample_size=1, sample_fraction=0.5)
+        with self.assertRaises(ValueError):
+            resolve_sample_size(100, sample_fraction=1.5)
+
+
+class VQASampledReadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.dataset_dir = os.path.join(self.tmp_dir.name, "vqa")
+        self.rows = make_vqa_rows(30)
+        self.rows[4][2] = ""
+        write_vqa_dataset(self.dataset_dir, self.rows)
+
+    def _iterator(self, **kwargs) -> VQADatasetIterator:
+        return VQADatasetIterator(task_name="VQA", dataset_name="test", dataset_dir_path=self.dataset_dir, **kwargs)
+
+    def test_sampled_values_match_full_read(self):
+        full = {sample[0]: sample for sample in sample_values(self._iterator())}
+        sampled = sample_values(self._iterator(sample_size=10, sample_seed=3))
+        self.assertEqual(len(sampled), 10)
+        for sample in sampled:
+            self.assertEqual(sample, full[sample[0]])
+
+    def test_whole_dataset_sample_matches_full_read(self):
+        # Пустой ответ превращает столбец в float с NaN, выборка должна вернуть те же значения
+        self.assertEqual(sample_values(self._iterator(sample_fraction=1.0)), sample_values(self._iterator()))
+
+
+    def test_sample_respects_filters(self):
+        samples = list(self._iterator(sample_size=3, filter_doc_class="doc_1", filter_question_type="type_0"))
+        self.assertEqual(len(samples), 3)
+        self.assertTrue(all((s.doc_class, s.question_type) == ("doc_1", "type_0") for s in samples))
+
+    def test_sample_respects_start(self):
+        # start=11 соответствует строке данных 10, как при полном чтении
+        full = {sample[1]: sample[2:] for sample in sample_values(self._iterator(start=11))}
+        samples = sample_values(self._iterator(start=11, sample_fraction=1.0))
+        self.assertEqual(len(samples), len(self.rows) - 10)
+        self.assertEqual({sample[1]: sample[2:] for sample in samples}, full)
+
+    def test_stratified_sample_of_dataset(self):
+        samples = list(self._iterator(sample_size=6, stratify_by=["doc_class"], sample_seed=1))
+        self.assertEqual(Counter(sample.doc_class for sample in samples), {"doc_0": 2, "doc_1": 2, "doc_2": 2})
+
+    def test_index_falls_back_to_cache_for_read_only_dataset(self):
+        cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        real_build_vqa_index = dataset_index.build_vqa_index
+
+        def build_vqa_index(dataset_dir_path, csv_name, index_dir_path=None):
+            if index_dir_path == dataset_dir_path:
+                raise PermissionError(13, "Permission denied", dataset_dir_path)
+            return real_build_vqa_index(dataset_dir_path, csv_name, index_dir_path=index_dir_path)
+
+        with mock.patch.dict(os.environ, {"DATASET_ITERATOR_CACHE_DIR": cache_dir}), \
+                mock.patch("dataset_iterator.dataset_index.build_vqa_index", side_effect=build_vqa_index):
+            self.assertEqual(len(list(self._iterator(sample_size=5))), 5)
+            # Второй запуск берёт индекс из кэша
+            self.assertEqual(len(list(self._iterator(sample_size=5))), 5)
+        self.assertEqual(os.listdir(self.dataset_dir), ["annotation.csv"])
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_index_build_error_is_clear(self):
+        with mock.patch("dataset_iterator.dataset_index.build_vqa_index", side_effect=PermissionError("read-only")):
+            with self.assertRaisesRegex(ValueError, "dataset-iterator index --output-dir"):
+                self._iterator(sample_size=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from dataset_iterator.answer_sink import get_answer_sink
+from dataset_iterator.rpo_iterator import RPOSample
+from dataset_iterator.sorting_runner import SortingRunner
+
+from .datasets import ListIterator
+
+
+class _Model:
+    """Модель, которая падает на пачках документов из failing_images."""
+
+    model_name = "test"
+    framework = "test"
+
+    def __init__(self, failing_images=()) -> None:
+        self.failing_images = set(failing_images)
+
+    def predict_on_images(self, images, question) -> str:
+        if self.failing_images & set(images):
+            raise RuntimeError("model failed")
+        return ",".join(str(i) for i in range(len(images)))
+
+
+class SortingRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cls_path = os.path.join(self.tmp_dir.name, "cls.csv")
+        # В пачке 0 два класса документов, в пачке 1 - один
+        get_answer_sink("csv", self.cls_path).write([(0, "aabb"), (1, "ccc")])
+        self.samples = [RPOSample(0, ["0a", "0b", "0c", "0d"], {}, "prompt"),
+                        RPOSample(1, ["1a", "1b", "1c"], {}, "prompt")]
+
+    def _run(self, model) -> SortingRunner:
+        runner = SortingRunner(ListIterator(self.samples, task_name="RPOSorting"), model, self.tmp_dir.name,
+                               classification_answers_path=self.cls_path, retry_delay=0)
+        runner.run()
+        return runner
+
+    def test_answers_for_every_class(self):
+        runner = self._run(_Model())
+        self.assertEqual([(a.sample_id, a.model_answer) for a in runner.model_answers],
+                         [(0, "01"), (0, "01"), (1, "012")])
+        self.assertEqual(runner.model_errors, [])
+
+    def test_failed_class_drops_partial_answers(self):
+        # Второй класс пачки 0 падает: ответ на первый класс не должен сохраниться
+        runner = self._run(_Model(failing_images={"0c"}))
+        self.assertEqual([(a.sample_id, a.model_answer) for a in runner.model_answers], [(1, "012")])
+        self.assertEqual([error.sample_id for error in runner.model_errors], [0])
+
+
+if __name__ == "__main__":
+    unittest.main()